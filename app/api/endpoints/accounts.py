@@ -10,13 +10,12 @@ import asyncio
 
 from app.services.auth_service import get_current_user_optional
 from app.models.pydantic_models import APIResponse, AccountStatsMetric, CitizenAccountStatsResponse, RepresentativeAccountStatsResponse, AccountStatsRequest
-from app.services.post_service import PostService
+from app.services.db_service import db_service
 from app.services.representative_evote_service import RepresentativeEVoteService
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-post_service = PostService()
 evote_service = RepresentativeEVoteService()
 
 @router.post("/stats", response_model=APIResponse)
@@ -58,13 +57,11 @@ async def get_account_stats_post(
 async def get_citizen_account_stats(account_id: UUID) -> CitizenAccountStatsResponse:
     """Get statistics for a citizen account"""
     try:
-        # Get posts data using existing service
-        posts = await post_service.get_posts_by_user(account_id)
-        
-        # Calculate citizen metrics from posts data
-        posts_count = len(posts) if posts else 0
-        comments_received = sum(post.get("comment_count", 0) for post in posts) if posts else 0
-        upvotes_received = sum(post.get("upvotes", 0) for post in posts) if posts else 0
+        # Aggregate citizen metrics over the account's posts in a single query
+        totals = await db_service.get_user_post_totals(account_id)
+        posts_count = totals["posts_count"]
+        comments_received = totals["comments_received"]
+        upvotes_received = totals["upvotes_received"]
         
         # Calculate total views (using mock calculation for now)
         # TODO: Replace with actual view tracking when implemented
@@ -1,17 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Form, UploadFile, File
 from typing import Optional, List, Dict, Any
 from app.schemas import PostCreate, PostUpdate, PostStatusUpdate, PostAssigneeUpdate, PostResponse, PaginatedResponse, APIResponse, AssigneeOption, TitleInfo, JurisdictionInfo
-from app.services.post_service import PostService
+from app.services.post_service import post_service, encode_post_cursor
 from app.services.mixed_content_service import mixed_content_service
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 from app.services.auth_service import get_current_user, get_current_user_optional
 from app.services.s3_upload_service import s3_upload_service
 from app.core.config import settings
 from app.core.logging_config import get_logger, log_error_with_context
 
 router = APIRouter()
-post_service = PostService()
-db_service = DatabaseService()
 logger = get_logger('app.posts')
 
 
@@ -81,6 +79,8 @@ async def get_posts_only(
     assignee: Optional[List[str]] = Query(None, description="Filter by assignee representative IDs (can specify multiple)"),
     sort_by: str = Query("timestamp"),
     order: str = Query("desc"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor; takes precedence over page"),
+    summary: bool = Query(False, description="Return post summaries without content, media_urls and assignee_info"),
     current_user: Optional[Dict[str, Any]] = Depends(get_current_user)
 ):
     """Get only user-generated posts (no news) with filters and pagination"""
@@ -99,25 +99,32 @@ async def get_posts_only(
             limit=size,
             post_type=post_type,
             assignee=assignee,
-            current_user_id=user_id
+            current_user_id=user_id,
+            cursor=cursor,
+            summary=summary
         )
         
         # Add source field to posts
         for post in posts:
             post["source"] = "post"
         
+        has_more = len(posts) >= size  # Simple check for now
+        
         # Convert to paginated response format
         paginated_posts = PaginatedResponse(
             items=posts,
             total=len(posts),  # For now, we'll use the current count
             page=page,
             size=size,
-            has_more=len(posts) >= size  # Simple check for now
+            has_more=has_more,
+            next_cursor=encode_post_cursor(posts[-1]) if has_more else None
         )
         
         logger.info(f"Successfully fetched {len(posts)} posts only for user {user_id or 'anonymous'}")
         return paginated_posts
         
+    except HTTPException:
+        raise
     except Exception as e:
         log_error_with_context(
             logger, e,
@@ -22,10 +22,9 @@ from app.models.user import User
 
 # Existing imports (would be adjusted based on actual structure)
 from app.schemas import PostCreate, PostUpdate, PostResponse, PaginatedResponse
-from app.services.post_service import PostService
+from app.services.post_service import post_service
 
 router = APIRouter()
-post_service = PostService()
 
 # Method 1: Using middleware dependency for automatic permission checking
 @router.get("", response_model=PaginatedResponse, dependencies=[Depends(check_permission_dependency)])
@@ -3,7 +3,7 @@ Recommendations API endpoints
 Handles feed generation and event tracking for the recommendation system
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 import asyncpg
 from typing import List, Optional, Dict, Any
 import random
@@ -13,12 +13,14 @@ import logging
 from uuid import UUID
 
 from app.core.config import settings
-from app.db.database import get_db
+from app.db.database import db_manager, get_db
 from app.schemas.recommendations import (
     EventCreate, EventResponse, FeedRequest, FeedResponse, 
     PostRecommendation, RecommendationMetadata
 )
-from app.services.recommendation_engine import RecommendationEngine
+from app.services.recommendation_engine import (
+    RecommendationEngine, invalidate_user_feed, invalidate_user_preferences
+)
 
 logger = logging.getLogger(__name__)
 
@@ -137,13 +139,12 @@ async def log_interaction_event(
 
 @router.get("/feed", response_model=FeedResponse)
 async def get_personalized_feed(
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100, description="Number of posts to return"),
     cursor: Optional[str] = None,
     surface: str = "main_feed",
     include_metadata: bool = False,
     user_latitude: Optional[float] = None,
     user_longitude: Optional[float] = None,
-    db: asyncpg.Connection = Depends(get_db),
     user_id: str = "a6bafa72-ab86-4d0b-b901-06e9364b67d3"  # Temporary: use real user UUID since auth is disabled
 ):
     """
@@ -162,7 +163,7 @@ async def get_personalized_feed(
     
     try:
         # Initialize recommendation engine
-        engine = RecommendationEngine(db)
+        engine = RecommendationEngine()
         
         # Generate personalized candidates
         candidates = await engine.generate_feed(
@@ -238,11 +239,10 @@ async def get_personalized_feed(
         
         # Fallback to simple recency-based feed
         logger.info("Falling back to simple recency feed")
-        return await _fallback_recency_feed(db, user_id, limit, surface, include_metadata)
+        return await _fallback_recency_feed(user_id, limit, surface, include_metadata)
 
 
 async def _fallback_recency_feed(
-    db: asyncpg.Connection,
     user_id: str,
     limit: int,
     surface: str,
@@ -267,7 +267,9 @@ async def _fallback_recency_feed(
         LIMIT $1
     """
     
-    results = await db.fetch(query, limit + 1)
+    # The feed endpoint holds no connection of its own; take one only when falling back
+    async with db_manager.get_connection() as db:
+        results = await db.fetch(query, limit + 1)
     
     # Convert to response format
     posts = []
@@ -416,6 +418,8 @@ async def refresh_affinities(db: asyncpg.Connection = Depends(get_db)):
         await db.execute("SELECT update_user_topic_affinities();")
         # Author affinities
         await db.execute("SELECT update_user_author_affinities();")
+        invalidate_user_preferences()
+        invalidate_user_feed()
         return {"success": True, "message": "user affinities updated"}
     except Exception as e:
         logger.error(f"Error updating affinities: {e}")
@@ -7,7 +7,7 @@ from typing import List
 from uuid import UUID
 
 from app.models.pydantic_models import TitleCreate, TitleUpdate, TitleResponse, APIResponse
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 from app.services.auth_service import get_current_user
 from app.core.logging_config import get_logger
 
@@ -15,7 +15,6 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="", tags=["titles"])
 
 # Initialize database service
-db_service = DatabaseService()
 
 @router.post("", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
 async def create_title(
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, UploadFile, File
 from app.services.auth_service import get_current_user, get_current_user_optional
 from app.services.user_service import UserService
-from app.services.post_service import PostService
+from app.services.post_service import post_service
 from app.services.representative_service import RepresentativeService
 from app.services.s3_upload_service import s3_upload_service
 from app.models.pydantic_models import APIResponse, UserUpdate, UserResponse, UserWithRepresentativeResponse, PublicUserWithRepresentativeResponse
@@ -12,7 +12,6 @@ import logging
 
 router = APIRouter()
 user_service = UserService()
-post_service = PostService()
 representative_service = RepresentativeService()
 logger = logging.getLogger(__name__)
 
@@ -105,8 +104,7 @@ async def get_user_by_id(
     
     # Add follow status if current user is authenticated, different from profile user, and requested
     if current_user and current_user.get("id") and str(user_id) != str(current_user["id"]) and include_follow_status:
-        from app.services.db_service import DatabaseService
-        db_service = DatabaseService()
+        from app.services.db_service import db_service
         
         current_user_id = current_user["id"]
         if isinstance(current_user_id, str):
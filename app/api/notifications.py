@@ -5,14 +5,13 @@ import logging
 import uuid
 from pathlib import Path
 
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 from app.services.auth_service import get_current_user
 from app.models.pydantic_models import PushSubscriptionCreate, PushSubscriptionResponse, NotificationResponse
 from app.core.logging_config import get_logger
 
 logger = get_logger('app.notifications')
 router = APIRouter(prefix="/api/v1/notifications", tags=["notifications"])
-db_service = DatabaseService()
 
 @router.post("/subscribe", response_model=Dict[str, Any])
 async def subscribe_to_push_notifications(
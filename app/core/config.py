@@ -38,6 +38,9 @@ class Settings(BaseSettings):
     # Database - PostgreSQL with PostGIS
     database_url: str = "postgresql://mahammad.safiq@localhost:5432/civicpulse"
     
+    # Redis - optional, shared state across worker processes
+    redis_url: Optional[str] = None
+    
     # CORS - Fully open for local development
     allowed_origins: List[str] = ["*"]  # Allow all origins for development
     allow_credentials: bool = True
@@ -92,8 +95,13 @@ class Settings(BaseSettings):
     enable_rate_limiting: bool = False  # Explicitly disable rate limiting
     
     # Performance
-    database_pool_size: int = 20
-    database_max_overflow: int = 30
+    # Pool sizes are per worker process: workers x database_pool_size must stay below the
+    # server's max_connections (e.g. 4 workers x 20 = 80 of PostgreSQL's default 100)
+    database_pool_min_size: int = 5
+    database_pool_size: int = 20  # Maximum connections in the asyncpg pool
+    database_pool_max_queries: int = 50_000  # Recycle a connection after this many queries
+    database_pool_max_inactive_lifetime: float = 300.0  # Close idle connections after N seconds
+    database_statement_cache_size: int = 1024  # Prepared statements cached per connection
     query_timeout_seconds: int = 30
     
     # WebSocket Configuration
@@ -1,5 +1,6 @@
 import asyncpg
 import asyncio
+import time
 from typing import AsyncGenerator, Optional, Dict, Any, List, Union
 from contextlib import asynccontextmanager
 import logging
@@ -8,26 +9,36 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Warn (at most once per interval) when this share of the pool is checked out
+POOL_SATURATION_WARN_RATIO = 0.8
+POOL_SATURATION_LOG_INTERVAL_SECONDS = 60
+
 class DatabaseManager:
     """Async PostgreSQL database manager with connection pooling"""
     
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+        self._last_saturation_warning = 0.0
     
     async def create_pool(self):
         """Create database connection pool"""
         try:
             # Create asyncpg pool for raw SQL operations
-            self.pool = await asyncpg.create_pool(
+            pool = await asyncpg.create_pool(
                 settings.database_url,
-                min_size=5,
-                max_size=20,
+                min_size=settings.database_pool_min_size,
+                max_size=settings.database_pool_size,
+                max_queries=settings.database_pool_max_queries,
+                max_inactive_connection_lifetime=settings.database_pool_max_inactive_lifetime,
                 command_timeout=60,
+                statement_cache_size=settings.database_statement_cache_size,
                 server_settings={
                     'application_name': 'civicpulse_api',
                     'timezone': 'UTC'
                 }
             )
+            self.pool = pool
             
             logger.info("Database connection pool created successfully")
         except (asyncpg.PostgresError, asyncpg.ConnectionDoesNotExistError, OSError) as e:
@@ -124,10 +135,27 @@ class DatabaseManager:
     async def get_connection(self) -> AsyncGenerator[asyncpg.Connection, None]:
         """Get database connection from pool"""
         if not self.pool:
-            await self.create_pool()
+            # Requests fanned out with asyncio.gather can all arrive here before the pool
+            # exists; only the first one may create it
+            async with self._pool_lock:
+                if not self.pool:
+                    await self.create_pool()
         
+        self._check_pool_saturation()
         async with self.pool.acquire() as connection:
             yield connection
+    
+    def _check_pool_saturation(self):
+        """Log when most pool connections are in use, a sign the pool is the bottleneck"""
+        max_size = self.pool.get_max_size()
+        in_use = self.pool.get_size() - self.pool.get_idle_size()
+        if in_use < max_size * POOL_SATURATION_WARN_RATIO:
+            return
+        
+        now = time.monotonic()
+        if now - self._last_saturation_warning >= POOL_SATURATION_LOG_INTERVAL_SECONDS:
+            self._last_saturation_warning = now
+            logger.warning(f"Database pool near saturation: {in_use}/{max_size} connections in use")
 
 # Global database manager instance
 db_manager = DatabaseManager()
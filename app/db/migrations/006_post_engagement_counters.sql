@@ -0,0 +1,87 @@
+-- Migration: Maintain post engagement counters
+-- Created: 2026-10-17
+-- Description: Keeps posts.upvotes, posts.downvotes and posts.comment_count in sync with
+-- the votes and comments tables so reads no longer need to aggregate them
+
+-- Trigger to update posts vote counters when post votes change
+CREATE OR REPLACE FUNCTION update_post_vote_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.post_id IS NOT NULL THEN
+            UPDATE posts SET
+                upvotes = upvotes + (NEW.vote_type = 'upvote')::int,
+                downvotes = downvotes + (NEW.vote_type = 'downvote')::int
+            WHERE id = NEW.post_id;
+        END IF;
+        RETURN NEW;
+    ELSIF TG_OP = 'UPDATE' THEN
+        IF NEW.post_id IS NOT NULL AND NEW.vote_type IS DISTINCT FROM OLD.vote_type THEN
+            UPDATE posts SET
+                upvotes = upvotes + (NEW.vote_type = 'upvote')::int - (OLD.vote_type = 'upvote')::int,
+                downvotes = downvotes + (NEW.vote_type = 'downvote')::int - (OLD.vote_type = 'downvote')::int
+            WHERE id = NEW.post_id;
+        END IF;
+        RETURN NEW;
+    ELSIF TG_OP = 'DELETE' THEN
+        IF OLD.post_id IS NOT NULL THEN
+            UPDATE posts SET
+                upvotes = GREATEST(upvotes - (OLD.vote_type = 'upvote')::int, 0),
+                downvotes = GREATEST(downvotes - (OLD.vote_type = 'downvote')::int, 0)
+            WHERE id = OLD.post_id;
+        END IF;
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_update_post_vote_counts ON votes;
+CREATE TRIGGER trigger_update_post_vote_counts
+    AFTER INSERT OR UPDATE OR DELETE ON votes
+    FOR EACH ROW
+    EXECUTE FUNCTION update_post_vote_counts();
+
+-- Trigger to update posts.comment_count when comments change
+CREATE OR REPLACE FUNCTION update_post_comment_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE posts
+        SET comment_count = comment_count + 1
+        WHERE id = NEW.post_id;
+        RETURN NEW;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE posts
+        SET comment_count = GREATEST(comment_count - 1, 0)
+        WHERE id = OLD.post_id;
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_update_post_comment_count ON comments;
+CREATE TRIGGER trigger_update_post_comment_count
+    AFTER INSERT OR DELETE ON comments
+    FOR EACH ROW
+    EXECUTE FUNCTION update_post_comment_count();
+
+-- Initialize counters for existing posts
+UPDATE posts
+SET upvotes = COALESCE((
+        SELECT COUNT(*) FROM votes
+        WHERE votes.post_id = posts.id AND vote_type = 'upvote'
+    ), 0),
+    downvotes = COALESCE((
+        SELECT COUNT(*) FROM votes
+        WHERE votes.post_id = posts.id AND vote_type = 'downvote'
+    ), 0),
+    comment_count = COALESCE((
+        SELECT COUNT(*) FROM comments
+        WHERE comments.post_id = posts.id
+    ), 0);
+
+ALTER TABLE posts ALTER COLUMN upvotes SET NOT NULL;
+ALTER TABLE posts ALTER COLUMN downvotes SET NOT NULL;
+ALTER TABLE posts ALTER COLUMN comment_count SET NOT NULL;
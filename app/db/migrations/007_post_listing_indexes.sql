@@ -0,0 +1,26 @@
+-- Migration: Composite indexes for post listings and trending
+-- Created: 2026-10-17
+-- Description: Lets filtered listings (ORDER BY created_at DESC) and the trending
+-- time-window aggregates use index range scans instead of sorting or scanning posts
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY)
+
+-- Listings filtered by post type
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_posts_type_created
+    ON posts (post_type, created_at DESC);
+
+-- Listings filtered by author (all statuses; idx_posts_user_open only covers open posts)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_posts_user_created
+    ON posts (user_id, created_at DESC);
+
+-- Listings filtered by assignee
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_posts_assignee_created
+    ON posts (assignee, created_at DESC)
+    WHERE assignee IS NOT NULL;
+
+-- Trending: recent post votes and comments aggregated per post
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_votes_created_post
+    ON votes (created_at, post_id)
+    WHERE post_id IS NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_comments_created_post
+    ON comments (created_at, post_id);
@@ -0,0 +1,12 @@
+-- Migration: Index for keyset pagination of posts
+-- Created: 2026-10-17
+-- Description: Matches ORDER BY created_at DESC, id DESC so cursor pages
+-- ((created_at, id) < ($1, $2)) are read straight from the index
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_posts_created_id
+    ON posts (created_at DESC, id DESC);
+
+-- Superseded by the index above, which also serves ORDER BY created_at DESC alone
+DROP INDEX CONCURRENTLY IF EXISTS idx_posts_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_posts_created_at_desc;
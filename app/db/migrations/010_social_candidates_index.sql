@@ -0,0 +1,13 @@
+-- Migration: Partial covering index for social recommendation candidates
+-- Created: 2026-10-17
+-- Description: The social candidate source reads a user's followed or high-affinity authors
+-- (is_following OR score > 0.5); indexing only those rows with author_id included lets
+-- that lookup be an index-only scan over a much smaller B-tree
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY)
+
+-- The posts side of the join (user_id, created_at DESC) is covered by idx_posts_user_created
+-- from 007_post_listing_indexes.sql
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_author_affinity_social
+    ON user_author_affinity (user_id, score DESC)
+    INCLUDE (author_id, is_following)
+    WHERE is_following = true OR score > 0.5;
@@ -0,0 +1,21 @@
+-- Migration: Covering indexes for eVote reads
+-- Created: 2026-10-17
+-- Description: Trend graphs look up the latest daily count on or before each day, and the
+-- eVote history lists a user's eVotes newest first; these indexes serve both without
+-- touching the heap or sorting
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY)
+
+-- CHECK_USER_EVOTE is served by the unique_user_representative_evote constraint and the
+-- per-representative COUNT by idx_representative_evotes_representative_id (005_evote_feature.sql)
+
+-- Latest daily count per representative as an index-only scan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_representative_evote_daily_counts_rep_date_total
+    ON representative_evote_daily_counts (representative_id, date DESC)
+    INCLUDE (total_evotes);
+
+-- Superseded by the index above (and duplicated the unique_representative_date constraint)
+DROP INDEX CONCURRENTLY IF EXISTS idx_representative_evote_daily_counts_rep_date;
+
+-- A user's eVote history, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_representative_evotes_user_created
+    ON representative_evotes (user_id, created_at DESC);
@@ -553,25 +553,41 @@ class RepresentativeEVoteQueries:
         WHERE user_id = $1 AND representative_id = $2;
     """
     
-    # Add eVote for representative
+    # Lock the representative row so concurrent eVote writes for it are serialized
+    LOCK_REPRESENTATIVE_FOR_EVOTE = """
+        SELECT id FROM representatives WHERE id = $1 FOR UPDATE;
+    """
+    
+    # Add eVote for representative; returns no row when the user had already eVoted
     ADD_EVOTE = """
         INSERT INTO representative_evotes (user_id, representative_id)
         VALUES ($1, $2)
-        RETURNING id, created_at;
+        ON CONFLICT ON CONSTRAINT unique_user_representative_evote DO NOTHING
+        RETURNING created_at as evoted_at;
     """
     
-    # Remove eVote for representative
+    # Remove eVote for representative; returns no row when the user had not eVoted
     REMOVE_EVOTE = """
         DELETE FROM representative_evotes 
         WHERE user_id = $1 AND representative_id = $2
-        RETURNING id;
-    """
-    
-    # Get total eVotes for representative
-    GET_TOTAL_EVOTES = """
-        SELECT COUNT(*) as total_evotes
-        FROM representative_evotes 
-        WHERE representative_id = $1;
+        RETURNING id as removed_id;
+    """
+    
+    # Record today's cumulative eVote total and return it; run after the write while
+    # holding the representative lock so the count includes every committed eVote
+    RECORD_DAILY_EVOTE_TOTAL = """
+        WITH total AS (
+            SELECT COUNT(*) as total_evotes
+            FROM representative_evotes
+            WHERE representative_id = $1
+        ),
+        daily AS (
+            INSERT INTO representative_evote_daily_counts (representative_id, date, total_evotes)
+            SELECT $1, $2::date, total_evotes FROM total
+            ON CONFLICT ON CONSTRAINT unique_representative_date
+            DO UPDATE SET total_evotes = EXCLUDED.total_evotes
+        )
+        SELECT total_evotes FROM total;
     """
     
     # Get representative eVote statistics
@@ -592,46 +608,23 @@ class RepresentativeEVoteQueries:
         WHERE r.id = $1;
     """
     
-    # Get most recent daily count before a date
-    GET_LAST_DAILY_COUNT = """
-        SELECT total_evotes 
-        FROM representative_evote_daily_counts
-        WHERE representative_id = $1 AND date < $2
-        ORDER BY date DESC 
-        LIMIT 1;
-    """
-    
-    # Get today's daily count record
-    GET_TODAY_DAILY_COUNT = """
-        SELECT total_evotes 
-        FROM representative_evote_daily_counts
-        WHERE representative_id = $1 AND date = $2;
-    """
-    
-    # Insert new daily count record
-    INSERT_DAILY_COUNT = """
-        INSERT INTO representative_evote_daily_counts (representative_id, date, total_evotes)
-        VALUES ($1, $2, $3)
-        RETURNING id;
-    """
-    
-    # Update existing daily count record
-    UPDATE_DAILY_COUNT = """
-        UPDATE representative_evote_daily_counts 
-        SET total_evotes = $3
-        WHERE representative_id = $1 AND date = $2
-        RETURNING id;
-    """
-    
-    # Get eVote trends for line graphs
+    # Get eVote trends for line graphs: one row per day from the day before $2 through $3,
+    # each carrying forward the latest daily count on or before that day (0 before any)
     GET_EVOTE_TRENDS = """
-        SELECT date, total_evotes 
-        FROM representative_evote_daily_counts
-        WHERE representative_id = $1 AND date >= $2
-        ORDER BY date;
-    """
-    
-    # Get user's eVoting history
+        SELECT
+            to_char(d.day, 'YYYY-MM-DD') as date,
+            COALESCE((
+                SELECT dc.total_evotes
+                FROM representative_evote_daily_counts dc
+                WHERE dc.representative_id = $1 AND dc.date <= d.day::date
+                ORDER BY dc.date DESC
+                LIMIT 1
+            ), 0) as total_evotes
+        FROM generate_series(($2::date - 1)::timestamp, $3::date::timestamp, INTERVAL '1 day') as d(day)
+        ORDER BY d.day;
+    """
+    
+    # Get user's eVoting history with the user's total eVote count on every row
     GET_USER_EVOTE_HISTORY = """
         SELECT 
             e.representative_id,
@@ -639,6 +632,7 @@ class RepresentativeEVoteQueries:
             r.id,
             r.title_id,
             r.jurisdiction_id,
+            t.title_name || ' - ' || j.name as representative_name,
             -- Get title info
             t.title_name,
             t.abbreviation,
@@ -657,7 +651,9 @@ class RepresentativeEVoteQueries:
             j.level_rank as jurisdiction_level_rank,
             j.parent_id as parent_jurisdiction_id,
             j.created_at as jurisdiction_created_at,
-            j.updated_at as jurisdiction_updated_at
+            j.updated_at as jurisdiction_updated_at,
+            -- Total eVotes for the user, so the page and its count come back together
+            COUNT(*) OVER () as total_count
         FROM representative_evotes e
         JOIN representatives r ON e.representative_id = r.id
         JOIN titles t ON r.title_id = t.id
@@ -667,7 +663,7 @@ class RepresentativeEVoteQueries:
         LIMIT $2 OFFSET $3;
     """
     
-    # Get user's active eVotes count
+    # Get user's active eVotes count (only needed when a page past the end comes back empty)
     GET_USER_EVOTES_COUNT = """
         SELECT COUNT(*) as total_count
         FROM representative_evotes 
@@ -0,0 +1,49 @@
+"""
+Optional Redis client for state shared across API worker processes
+Redis is only used when REDIS_URL is configured and the redis package is installed
+"""
+
+import logging
+from typing import Optional, Any
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+class RedisManager:
+    """Lazily created async Redis client"""
+    
+    def __init__(self):
+        self.client: Optional[Any] = None
+    
+    def is_enabled(self) -> bool:
+        """Check if Redis is configured and the client library is installed"""
+        return REDIS_AVAILABLE and bool(settings.redis_url)
+    
+    def get_client(self) -> Optional[Any]:
+        """Get the shared Redis client, or None when Redis is not enabled"""
+        if not self.is_enabled():
+            return None
+        
+        if self.client is None:
+            self.client = aioredis.from_url(settings.redis_url)
+            logger.info("Redis client created")
+        
+        return self.client
+    
+    async def close(self):
+        """Close the Redis client"""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+            logger.info("Redis client closed")
+
+# Global Redis manager instance
+redis_manager = RedisManager()
@@ -86,9 +86,9 @@ CREATE TABLE posts (
     tags TEXT[], -- Array of tags
     media_urls TEXT[], -- Array of media URLs (standardized name)
     -- Vote counts (updated via triggers)
-    upvotes INTEGER DEFAULT 0,
-    downvotes INTEGER DEFAULT 0,
-    comment_count INTEGER DEFAULT 0,
+    upvotes INTEGER NOT NULL DEFAULT 0,
+    downvotes INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
     view_count INTEGER DEFAULT 0,
     share_count INTEGER DEFAULT 0,
     priority_score INTEGER DEFAULT 0,
@@ -112,7 +112,7 @@ CREATE INDEX idx_posts_status ON posts (status);
 CREATE INDEX idx_posts_type ON posts (post_type);
 CREATE INDEX idx_posts_area ON posts (area);
 CREATE INDEX idx_posts_category ON posts (category);
-CREATE INDEX idx_posts_created_at ON posts (created_at DESC);
+CREATE INDEX idx_posts_created_id ON posts (created_at DESC, id DESC);
 CREATE INDEX idx_posts_updated_at ON posts (updated_at DESC);
 CREATE INDEX idx_posts_last_activity ON posts (last_activity_at DESC);
 CREATE INDEX idx_posts_search ON posts USING GIN (search_vector);
@@ -129,7 +129,6 @@ CREATE INDEX idx_posts_title_trgm ON posts USING GIN (title gin_trgm_ops);
 CREATE INDEX idx_posts_content_trgm ON posts USING GIN (content gin_trgm_ops);
 CREATE INDEX idx_posts_location_trgm ON posts USING GIN (location gin_trgm_ops);
 CREATE INDEX idx_posts_upvotes ON posts (upvotes DESC);
-CREATE INDEX idx_posts_created_at_desc ON posts (created_at DESC);
 CREATE INDEX idx_posts_status_type ON posts (status, post_type);
 CREATE INDEX idx_posts_type_status_created ON posts (post_type, status, created_at DESC);
 CREATE INDEX idx_posts_assignee_status ON posts (assignee, status) WHERE assignee IS NOT NULL;
@@ -401,6 +400,71 @@ CREATE TRIGGER follows_count_trigger
     FOR EACH ROW
     EXECUTE FUNCTION update_user_follow_counts();
 
+-- Functions and triggers for post engagement counters (see 006_post_engagement_counters.sql)
+-- Create function to update post vote counts when post votes change
+CREATE OR REPLACE FUNCTION update_post_vote_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.post_id IS NOT NULL THEN
+            UPDATE posts SET
+                upvotes = upvotes + (NEW.vote_type = 'upvote')::int,
+                downvotes = downvotes + (NEW.vote_type = 'downvote')::int
+            WHERE id = NEW.post_id;
+        END IF;
+        RETURN NEW;
+    ELSIF TG_OP = 'UPDATE' THEN
+        IF NEW.post_id IS NOT NULL AND NEW.vote_type IS DISTINCT FROM OLD.vote_type THEN
+            UPDATE posts SET
+                upvotes = upvotes + (NEW.vote_type = 'upvote')::int - (OLD.vote_type = 'upvote')::int,
+                downvotes = downvotes + (NEW.vote_type = 'downvote')::int - (OLD.vote_type = 'downvote')::int
+            WHERE id = NEW.post_id;
+        END IF;
+        RETURN NEW;
+    ELSIF TG_OP = 'DELETE' THEN
+        IF OLD.post_id IS NOT NULL THEN
+            UPDATE posts SET
+                upvotes = GREATEST(upvotes - (OLD.vote_type = 'upvote')::int, 0),
+                downvotes = GREATEST(downvotes - (OLD.vote_type = 'downvote')::int, 0)
+            WHERE id = OLD.post_id;
+        END IF;
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create trigger to automatically update post vote counts
+CREATE TRIGGER trigger_update_post_vote_counts
+    AFTER INSERT OR UPDATE OR DELETE ON votes
+    FOR EACH ROW
+    EXECUTE FUNCTION update_post_vote_counts();
+
+-- Create function to update post comment counts when comments change
+CREATE OR REPLACE FUNCTION update_post_comment_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE posts
+        SET comment_count = comment_count + 1
+        WHERE id = NEW.post_id;
+        RETURN NEW;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE posts
+        SET comment_count = GREATEST(comment_count - 1, 0)
+        WHERE id = OLD.post_id;
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create trigger to automatically update post comment counts
+CREATE TRIGGER trigger_update_post_comment_count
+    AFTER INSERT OR DELETE ON comments
+    FOR EACH ROW
+    EXECUTE FUNCTION update_post_comment_count();
+
 -- Search analytics table for tracking popular searches
 CREATE TABLE search_analytics (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -1,7 +1,8 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import logging
 import traceback
 import asyncio
@@ -29,6 +30,8 @@ from app.middleware.error_handler import (
 from app.api.v1.api import api_router
 from app.websocket.websocket_endpoints import router as websocket_router
 from app.db.database import startup_db, shutdown_db, db_manager
+from app.db.redis_client import redis_manager
+from app.services.notification_service import notification_service
 
 # Validate configuration on startup
 try:
@@ -84,6 +87,7 @@ def create_application() -> FastAPI:
         docs_url="/docs",  # Always enable docs in development
         redoc_url="/redoc",  # Always enable redoc in development
         openapi_url="/openapi.json",  # Always enable OpenAPI spec
+        default_response_class=ORJSONResponse,  # orjson natively encodes UUID/datetime
     )
 
     # Add permission middleware (temporarily disabled for stability)
@@ -121,6 +125,10 @@ def create_application() -> FastAPI:
     )
     logger.info(f"CORS middleware configured with origins: {cors_origins} (fully open for development)")
 
+    # Compress JSON payloads (post listings in particular) for clients that accept gzip
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    logger.info("GZip middleware enabled for responses over 1 KB")
+
     # Include API router
     app.include_router(api_router, prefix="/api/v1")
     logger.info("API routes registered")
@@ -141,6 +149,16 @@ def create_application() -> FastAPI:
     app.add_event_handler("shutdown", shutdown_db)
     logger.info("Database lifecycle events registered")
 
+    # Cross-process notification fan-out (only active when Redis is configured)
+    @app.on_event("startup")
+    async def start_notification_backplane():
+        notification_service.start_backplane()
+
+    @app.on_event("shutdown")
+    async def stop_notification_backplane():
+        await notification_service.stop_backplane()
+        await redis_manager.close()
+
     # Phase 2: schedule periodic jobs after DB startup
     scheduled_tasks = []
 
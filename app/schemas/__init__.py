@@ -397,6 +397,7 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     size: int
     has_more: bool
+    next_cursor: Optional[str] = None  # Keyset cursor for the next page, where supported
 
 
 # API Response
@@ -6,7 +6,7 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.security import verify_password, create_access_token, create_refresh_token, verify_token
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 from app.core.logging_config import get_logger, log_error_with_context
 from app.core.config import settings
 
@@ -18,7 +18,7 @@ class AuthService:
     """Service for authentication operations using raw SQL"""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
     
     async def authenticate_user(self, email: str, password: str) -> Optional[Dict[str, Any]]:
         """Authenticate user with email and password"""
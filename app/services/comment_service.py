@@ -10,7 +10,8 @@ from app.models.pydantic_models import (
     CommentCreate, CommentUpdate, CommentResponse, 
     VoteType, PaginatedResponse, AuthorInfo
 )
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
+from app.services.post_service import invalidate_post_cache
 from app.core.logging_config import get_logger
 
 logger = get_logger('app.services.comment')
@@ -20,7 +21,7 @@ class CommentService:
     """Service for comment-related operations"""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
     
     async def create_comment(self, comment_data: CommentCreate, user_id: UUID) -> CommentResponse:
         """
@@ -37,8 +38,8 @@ class CommentService:
             ValueError: If post doesn't exist or comment data is invalid
         """
         try:
-            # Validate post exists
-            post = await self.db_service.get_post_by_id(comment_data.post_id)
+            # Validate post exists; its title and author are needed for notifications
+            post = await self.db_service.get_post_title_and_author(comment_data.post_id)
             if not post:
                 raise ValueError("Post not found")
             
@@ -58,6 +59,7 @@ class CommentService:
             }
             
             new_comment = await self.db_service.create_comment(comment_dict, user_id)
+            await invalidate_post_cache(comment_data.post_id)
             
             # Get full comment with author info
             full_comment = await self.get_comment_by_id(new_comment['id'], user_id)
@@ -103,8 +105,7 @@ class CommentService:
         """
         try:
             # Validate post exists
-            post = await self.db_service.get_post_by_id(post_id)
-            if not post:
+            if not await self.db_service.post_exists(post_id):
                 raise ValueError("Post not found")
             
             # Calculate offset
@@ -240,6 +241,7 @@ class CommentService:
             success = await self.db_service.delete_comment(comment_id, user_id)
             
             if success:
+                await invalidate_post_cache(existing_comment['post_id'])
                 logger.info(f"Comment deleted successfully | ID: {comment_id} | User: {user_id}")
             
             return success
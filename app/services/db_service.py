@@ -3,7 +3,9 @@ Database service layer using raw SQL with asyncpg for production-ready operation
 """
 import logging
 import asyncio
-from typing import List, Optional, Dict, Any
+import time
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Set, Tuple
 from uuid import UUID, uuid4
 import asyncpg
 from app.db.database import db_manager
@@ -11,6 +13,42 @@ from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
 
+# Trending rankings scan recent votes and comments, so each worker shares one ranking per
+# (hours, limit) for TRENDING_CACHE_TTL_SECONDS and lets only one request recompute it.
+# Only the ranked post ids are cached; the posts themselves are read per request.
+TRENDING_CACHE_TTL_SECONDS = 60
+TRENDING_CACHE_MAX_ENTRIES = 100
+
+# (hours, limit) -> (post_ids, expires_at)
+_trending_cache: Dict[Tuple[int, int], Tuple[List[UUID], float]] = {}
+_trending_locks: Dict[Tuple[int, int], asyncio.Lock] = {}
+
+def _get_cached_trending(key: Tuple[int, int]) -> Optional[List[UUID]]:
+    """Return cached trending post ids if they have not expired"""
+    entry = _trending_cache.get(key)
+    if entry is None or entry[1] <= time.monotonic():
+        return None
+    
+    return entry[0]
+
+def _cache_trending(key: Tuple[int, int], post_ids: List[UUID]):
+    """Cache trending post ids for TRENDING_CACHE_TTL_SECONDS"""
+    if key not in _trending_cache and len(_trending_cache) >= TRENDING_CACHE_MAX_ENTRIES:
+        # Drop the oldest 25% of entries
+        items_to_remove = len(_trending_cache) // 4
+        for old_key in list(_trending_cache.keys())[:items_to_remove]:
+            del _trending_cache[old_key]
+            _trending_locks.pop(old_key, None)
+    
+    _trending_cache[key] = (post_ids, time.monotonic() + TRENDING_CACHE_TTL_SECONDS)
+
+# Rows a user may manage: their own posts, or posts assigned to a representative account linked to them.
+# Formatted with the placeholder of the acting user's id.
+_POST_MANAGER_CONDITION = (
+    "(posts.user_id = {user} OR EXISTS ("
+    "SELECT 1 FROM users WHERE users.id = {user} AND posts.assignee = ANY(users.rep_accounts)))"
+)
+
 class DatabaseService:
     """Service for database operations using raw SQL with asyncpg"""
     
@@ -388,13 +426,23 @@ class DatabaseService:
     
     # Post operations
     async def create_post(self, post_data: Dict[str, Any], user_id: UUID) -> Dict[str, Any]:
-        """Create a new post"""
+        """Create a new post and return it with author information, as get_post_by_id does"""
         async with db_manager.get_connection() as conn:
             post_id = uuid4()
             query = """
-                INSERT INTO posts (id, user_id, assignee, title, content, post_type, location, latitude, longitude, tags, media_urls)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-                RETURNING id, user_id, assignee, title, content, post_type, location, latitude, longitude, tags, media_urls, created_at, updated_at
+                WITH p AS (
+                    INSERT INTO posts (id, user_id, assignee, title, content, post_type, location, latitude, longitude, tags, media_urls)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+                    RETURNING *
+                )
+                SELECT p.id, p.title, p.content, p.post_type, p.status, p.assignee, COALESCE(p.media_urls, '{}') as media_urls, p.location, p.latitude, p.longitude, p.tags,
+                       p.upvotes, p.downvotes, p.comment_count, p.view_count, p.share_count, p.priority_score,
+                       p.created_at, p.updated_at, p.last_activity_at,
+                       u.id as user_id, u.username as author_username, 
+                       u.display_name as author_display_name, u.avatar_url as author_avatar_url,
+                       u.rep_accounts
+                FROM p
+                JOIN users u ON p.user_id = u.id
             """
             row = await conn.fetchrow(
                 query,
@@ -410,76 +458,95 @@ class DatabaseService:
                 post_data.get('tags', []),
                 post_data.get('media_urls', [])
             )
-            return dict(row)
+            return await self._attach_post_author(conn, row)
     
-    async def get_post_by_id(self, post_id: UUID) -> Optional[Dict[str, Any]]:
-        """Get post by ID with author information including rep_accounts"""
+    async def get_post_by_id(self, post_id: UUID, viewer_id: Optional[UUID] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get post by ID with author information including rep_accounts
+        When `viewer_id` is given, the viewer's user_vote_type / is_saved are fetched in the same statement
+        """
         async with db_manager.get_connection() as conn:
-            query = """
-                SELECT p.id, p.title, p.content, p.post_type, p.status, p.assignee, p.media_urls, p.location, p.latitude, p.longitude, p.tags,
+            viewer_columns = ""
+            viewer_joins = ""
+            values = [post_id]
+            if viewer_id:
+                viewer_columns = """,
+                       uv.vote_type as user_vote_type,
+                       sp.post_id IS NOT NULL as is_saved"""
+                viewer_joins = """
+                LEFT JOIN votes uv ON uv.post_id = p.id AND uv.user_id = $2
+                LEFT JOIN saved_posts sp ON sp.post_id = p.id AND sp.user_id = $2"""
+                values.append(viewer_id)
+            
+            query = f"""
+                SELECT p.id, p.title, p.content, p.post_type, p.status, p.assignee, COALESCE(p.media_urls, '{{}}') as media_urls, p.location, p.latitude, p.longitude, p.tags,
                        p.upvotes, p.downvotes, p.comment_count, p.view_count, p.share_count, p.priority_score,
                        p.created_at, p.updated_at, p.last_activity_at,
                        u.id as user_id, u.username as author_username, 
                        u.display_name as author_display_name, u.avatar_url as author_avatar_url,
-                       u.rep_accounts
+                       u.rep_accounts{viewer_columns}
                 FROM posts p
-                JOIN users u ON p.user_id = u.id
+                JOIN users u ON p.user_id = u.id{viewer_joins}
                 WHERE p.id = $1
             """
-            row = await conn.fetchrow(query, post_id)
+            row = await conn.fetchrow(query, *values)
             if not row:
                 return None
             
-            # Format the response
-            post = dict(row)
-            user_id = post.pop('user_id')
-            rep_accounts_ids = post.pop('rep_accounts')
-            
-            # Get detailed representative account information if rep_accounts exist
-            rep_accounts = []
-            if rep_accounts_ids:
-                rep_query = """
-                    SELECT r.id, r.user_id, r.created_at as linked_at,
-                           t.id as title_id, t.title_name, t.abbreviation, t.level_rank, t.description,
-                           j.id as jurisdiction_id, j.name as jurisdiction_name, j.level_name as jurisdiction_level
-                    FROM representatives r
-                    JOIN titles t ON r.title_id = t.id
-                    JOIN jurisdictions j ON r.jurisdiction_id = j.id
-                    WHERE r.id = ANY($1) AND r.user_id = $2
-                    ORDER BY t.level_rank DESC
-                """
-                rep_rows = await conn.fetch(rep_query, rep_accounts_ids, user_id)
-                
-                # Format representative accounts with nested structure
-                for rep_row in rep_rows:
-                    rep_data = dict(rep_row)
-                    formatted_rep = {
-                        'id': rep_data['id'],
-                        'title': {
-                            'id': rep_data['title_id'],
-                            'title_name': rep_data['title_name'],
-                            'abbreviation': rep_data['abbreviation'],
-                            'level_rank': rep_data['level_rank'],
-                            'description': rep_data['description']
-                        },
-                        'jurisdiction': {
-                            'id': rep_data['jurisdiction_id'],
-                            'name': rep_data['jurisdiction_name'],
-                            'level_name': rep_data['jurisdiction_level']
-                        },
-                        'linked_at': rep_data['linked_at']
-                    }
-                    rep_accounts.append(formatted_rep)
-            
-            post['author'] = {
-                'id': user_id,
-                'username': post.pop('author_username'),
-                'display_name': post.pop('author_display_name'),
-                'avatar_url': post.pop('author_avatar_url'),
-                'rep_accounts': rep_accounts
-            }
+            return await self._attach_post_author(conn, row)
+    
+    async def _attach_post_author(self, conn: asyncpg.Connection, row: asyncpg.Record) -> Dict[str, Any]:
+        """Nest author columns (and their rep_accounts) of a post row under post['author']"""
+        # Format the response
+        post = dict(row)
+        user_id = post.pop('user_id')
+        rep_accounts_ids = post.pop('rep_accounts')
+        
+        # Get detailed representative account information if rep_accounts exist
+        rep_accounts = []
+        if rep_accounts_ids:
+            rep_query = """
+                SELECT r.id, r.user_id, r.created_at as linked_at,
+                       t.id as title_id, t.title_name, t.abbreviation, t.level_rank, t.description,
+                       j.id as jurisdiction_id, j.name as jurisdiction_name, j.level_name as jurisdiction_level
+                FROM representatives r
+                JOIN titles t ON r.title_id = t.id
+                JOIN jurisdictions j ON r.jurisdiction_id = j.id
+                WHERE r.id = ANY($1) AND r.user_id = $2
+                ORDER BY t.level_rank DESC
+            """
+            rep_rows = await conn.fetch(rep_query, rep_accounts_ids, user_id)
             
-            return post
+            # Format representative accounts with nested structure
+            for rep_row in rep_rows:
+                rep_data = dict(rep_row)
+                formatted_rep = {
+                    'id': rep_data['id'],
+                    'title': {
+                        'id': rep_data['title_id'],
+                        'title_name': rep_data['title_name'],
+                        'abbreviation': rep_data['abbreviation'],
+                        'level_rank': rep_data['level_rank'],
+                        'description': rep_data['description']
+                    },
+                    'jurisdiction': {
+                        'id': rep_data['jurisdiction_id'],
+                        'name': rep_data['jurisdiction_name'],
+                        'level_name': rep_data['jurisdiction_level']
+                    },
+                    'linked_at': rep_data['linked_at']
+                }
+                rep_accounts.append(formatted_rep)
+        
+        post['author'] = {
+            'id': user_id,
+            'username': post.pop('author_username'),
+            'display_name': post.pop('author_display_name'),
+            'avatar_url': post.pop('author_avatar_url'),
+            'rep_accounts': rep_accounts
+        }
+        
+        return post
     
     async def get_posts(
         self,
@@ -489,20 +556,28 @@ class DatabaseService:
         user_id: Optional[UUID] = None,
         location: Optional[str] = None,
         assignee: Optional[List[str]] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        viewer_id: Optional[UUID] = None,
+        before: Optional[Tuple[datetime, UUID]] = None,
+        summary: bool = False
     ) -> List[Dict[str, Any]]:
-        """Get posts with filters and pagination including author rep_accounts"""
+        """
+        Get posts with filters and pagination including author rep_accounts
+        Each post also carries its engagement counters (upvotes, downvotes, comment_count)
+        and the viewer's user_vote_type / is_saved, fetched in the same statement
+        When `before` (created_at, id) is given, the page starts after that post and `skip` is ignored
+        With `summary`, content and media_urls are not fetched
+        """
+        body_columns = "" if summary else " p.content, p.media_urls,"
+        page_body_columns = "" if summary else " p.content, COALESCE(p.media_urls, '{}') as media_urls,"
         async with db_manager.get_connection() as conn:
-            # Build the base query
-            query = """
-                SELECT p.id, p.title, p.content, p.post_type, p.status, p.assignee,
-                       p.media_urls, p.location, p.latitude, p.longitude, p.tags, p.upvotes, p.downvotes, p.comment_count,
-                       p.created_at, p.updated_at,
-                       u.id as user_id, u.username as author_username, 
-                       u.display_name as author_display_name, u.avatar_url as author_avatar_url,
-                       u.rep_accounts
+            # Select the page first, then join viewer state only for those rows
+            page_query = f"""
+                SELECT p.id, p.user_id, p.title,{page_body_columns} p.post_type, p.status, p.assignee,
+                       p.location, p.latitude, p.longitude, p.tags,
+                       p.upvotes, p.downvotes, p.comment_count,
+                       p.created_at, p.updated_at
                 FROM posts p
-                JOIN users u ON p.user_id = u.id
             """
             
             conditions = []
@@ -526,31 +601,64 @@ class DatabaseService:
                 param_num += 1
             
             if assignee and len(assignee) > 0:
-                # Convert list of strings to list of UUIDs if needed
-                assignee_uuids = []
-                for a in assignee:
-                    if isinstance(a, str):
-                        assignee_uuids.append(UUID(a))
-                    else:
-                        assignee_uuids.append(a)
-                
-                # Use IN clause for multiple assignees
-                placeholders = [f"${param_num + i}" for i in range(len(assignee_uuids))]
-                conditions.append(f"p.assignee IN ({', '.join(placeholders)})")
-                values.extend(assignee_uuids)
-                param_num += len(assignee_uuids)
+                # Pass assignees as one array so the statement text (and its cached plan)
+                # does not change with the number of assignees. asyncpg's uuid codec accepts
+                # both UUID objects and strings, so ids from the query string go through as-is
+                conditions.append(f"p.assignee = ANY(${param_num}::uuid[])")
+                values.append(list(assignee))
+                param_num += 1
             
             if tags:
                 conditions.append(f"p.tags && ${param_num}")
                 values.append(tags)
                 param_num += 1
             
+            if before:
+                # Keyset pagination: seek past the last post of the previous page
+                conditions.append(f"(p.created_at, p.id) < (${param_num}, ${param_num + 1})")
+                values.extend(before)
+                param_num += 2
+            
             if conditions:
-                query += " WHERE " + " AND ".join(conditions)
+                page_query += " WHERE " + " AND ".join(conditions)
             
             # Order and pagination
-            query += f" ORDER BY p.created_at DESC OFFSET ${param_num} LIMIT ${param_num + 1}"
-            values.extend([skip, limit])
+            page_query += " ORDER BY p.created_at DESC, p.id DESC"
+            if before:
+                page_query += f" LIMIT ${param_num}"
+                values.append(limit)
+            else:
+                page_query += f" OFFSET ${param_num} LIMIT ${param_num + 1}"
+                values.extend([skip, limit])
+            param_num = len(values) + 1
+            
+            if viewer_id:
+                viewer_columns = """uv.vote_type as user_vote_type,
+                       sp.post_id IS NOT NULL as is_saved"""
+                viewer_joins = f"""
+                LEFT JOIN votes uv ON uv.post_id = p.id AND uv.user_id = ${param_num}
+                LEFT JOIN saved_posts sp ON sp.post_id = p.id AND sp.user_id = ${param_num}"""
+                values.append(viewer_id)
+            else:
+                # Anonymous viewers have no votes or saves; skip the joins entirely
+                viewer_columns = """NULL::vote_type as user_vote_type,
+                       FALSE as is_saved"""
+                viewer_joins = ""
+            
+            query = f"""
+                WITH page AS ({page_query})
+                SELECT p.id, p.title,{body_columns} p.post_type, p.status, p.assignee,
+                       p.location, p.latitude, p.longitude, p.tags,
+                       p.upvotes, p.downvotes, p.comment_count,
+                       p.created_at, p.updated_at,
+                       {viewer_columns},
+                       u.id as user_id, u.username as author_username, 
+                       u.display_name as author_display_name, u.avatar_url as author_avatar_url,
+                       u.rep_accounts
+                FROM page p
+                JOIN users u ON p.user_id = u.id{viewer_joins}
+                ORDER BY p.created_at DESC, p.id DESC
+            """
             
             rows = await conn.fetch(query, *values)
             
@@ -621,8 +729,50 @@ class DatabaseService:
             
             return posts
     
-    async def update_post(self, post_id: UUID, post_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Update post information"""
+    async def get_user_post_totals(self, user_id: UUID) -> Dict[str, int]:
+        """Get a user's post count and the comments/upvotes received across all their posts"""
+        async with db_manager.get_connection() as conn:
+            query = """
+                SELECT COUNT(*) as posts_count,
+                       COALESCE(SUM(comment_count), 0) as comments_received,
+                       COALESCE(SUM(upvotes), 0) as upvotes_received
+                FROM posts
+                WHERE user_id = $1
+            """
+            row = await conn.fetchrow(query, user_id)
+            return {key: int(value) for key, value in row.items()}
+    
+    async def post_exists(self, post_id: UUID) -> bool:
+        """Check if a post exists"""
+        async with db_manager.get_connection() as conn:
+            return await conn.fetchval("SELECT EXISTS (SELECT 1 FROM posts WHERE id = $1)", post_id)
+    
+    async def can_manage_post(self, post_id: UUID, user_id: UUID) -> bool:
+        """Check if a post exists and the user is its author or linked to its assignee"""
+        async with db_manager.get_connection() as conn:
+            query = "SELECT EXISTS (SELECT 1 FROM posts WHERE id = $1 AND {manager_condition})".format(
+                manager_condition=_POST_MANAGER_CONDITION.format(user="$2")
+            )
+            return await conn.fetchval(query, post_id, user_id)
+    
+    async def get_post_title_and_author(self, post_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get just a post's title and author id (as a string), e.g. for notifications"""
+        async with db_manager.get_connection() as conn:
+            row = await conn.fetchrow("SELECT title, user_id FROM posts WHERE id = $1", post_id)
+            if not row:
+                return None
+            return {'title': row['title'], 'user_id': str(row['user_id'])}
+    
+    async def update_post(
+        self,
+        post_id: UUID,
+        post_data: Dict[str, Any],
+        author_id: Optional[UUID] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update post information
+        If author_id is given, only that author's post is updated; returns None when nothing matched
+        """
         async with db_manager.get_connection() as conn:
             # Build dynamic update query
             set_clauses = []
@@ -635,16 +785,21 @@ class DatabaseService:
                     values.append(value)
                     param_num += 1
             
-            if not set_clauses:
+            if not set_clauses and author_id is None:
                 return await self.get_post_by_id(post_id)
             
             set_clauses.append(f"updated_at = NOW()")
             values.append(post_id)
+            where_clause = f"id = ${param_num}"
+            
+            if author_id is not None:
+                values.append(author_id)
+                where_clause += f" AND user_id = ${param_num + 1}"
             
             query = f"""
                 UPDATE posts 
                 SET {', '.join(set_clauses)}
-                WHERE id = ${param_num}
+                WHERE {where_clause}
                 RETURNING id, user_id, title, content, post_type, location, tags, media_urls, created_at, updated_at
             """
             
@@ -655,103 +810,126 @@ class DatabaseService:
             # Get the full post with author info
             return await self.get_post_by_id(post_id)
 
-    async def update_post_status(self, post_id: UUID, status: str) -> Optional[Dict[str, Any]]:
-        """Update post status specifically"""
+    async def update_post_status(
+        self,
+        post_id: UUID,
+        status: str,
+        manager_id: Optional[UUID] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update post status specifically
+        If manager_id is given, the update only applies when that user is the author or linked to the assignee
+        """
         async with db_manager.get_connection() as conn:
             query = """
                 UPDATE posts 
                 SET status = $1, updated_at = NOW(), last_activity_at = NOW()
-                WHERE id = $2
+                WHERE id = $2 AND ($3::uuid IS NULL OR {manager_condition})
                 RETURNING id, user_id, assignee
-            """
+            """.format(manager_condition=_POST_MANAGER_CONDITION.format(user="$3"))
             
-            row = await conn.fetchrow(query, status, post_id)
+            row = await conn.fetchrow(query, status, post_id, manager_id)
             if not row:
                 return None
             
             # Get the full post with author info
             return await self.get_post_by_id(post_id)
 
-    async def update_post_assignee(self, post_id: UUID, assignee_id: Optional[str]) -> Optional[Dict[str, Any]]:
-        """Update post assignee specifically"""
+    async def update_post_assignee(
+        self,
+        post_id: UUID,
+        assignee_id: Optional[str],
+        manager_id: Optional[UUID] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update post assignee specifically
+        If manager_id is given, the update only applies when that user is the author or linked to the current assignee.
+        Returns None without updating when the post doesn't match or the new assignee isn't a representative.
+        """
         async with db_manager.get_connection() as conn:
             query = """
                 UPDATE posts 
                 SET assignee = $1, updated_at = NOW(), last_activity_at = NOW()
-                WHERE id = $2
+                WHERE id = $2 AND ($3::uuid IS NULL OR {manager_condition})
+                  AND ($1::uuid IS NULL OR EXISTS (SELECT 1 FROM representatives WHERE id = $1))
                 RETURNING id, user_id, assignee
-            """
+            """.format(manager_condition=_POST_MANAGER_CONDITION.format(user="$3"))
             
             # Convert assignee_id to UUID if provided, otherwise set to None
             assignee_uuid = UUID(assignee_id) if assignee_id else None
             
-            row = await conn.fetchrow(query, assignee_uuid, post_id)
+            row = await conn.fetchrow(query, assignee_uuid, post_id, manager_id)
             if not row:
                 return None
             
             # Get the full post with author info
             return await self.get_post_by_id(post_id)
     
-    async def delete_post(self, post_id: UUID) -> bool:
-        """Delete post by ID"""
+    async def delete_post(self, post_id: UUID, author_id: Optional[UUID] = None) -> bool:
+        """Delete post by ID, restricted to author_id's posts when given"""
         async with db_manager.get_connection() as conn:
-            query = "DELETE FROM posts WHERE id = $1"
-            result = await conn.execute(query, post_id)
+            query = "DELETE FROM posts WHERE id = $1 AND ($2::uuid IS NULL OR user_id = $2)"
+            result = await conn.execute(query, post_id, author_id)
             return result == "DELETE 1"
     
     # Vote operations
-    async def create_or_update_vote(self, post_id: UUID, user_id: UUID, vote_type: str) -> Optional[Dict[str, Any]]:
-        """Create or update a vote on a post"""
+    async def create_or_update_vote(
+        self, post_id: UUID, user_id: UUID, vote_type: str
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, int]]:
+        """
+        Create, switch or toggle off a user's vote on a post
+        Returns the user's resulting vote (None when the same vote toggled it off)
+        and the post's updated upvotes/downvotes
+        """
         async with db_manager.get_connection() as conn:
-            # Check if vote already exists
-            existing_query = "SELECT id, vote_type FROM votes WHERE post_id = $1 AND user_id = $2"
-            existing_vote = await conn.fetchrow(existing_query, post_id, user_id)
-            
-            if existing_vote:
-                if existing_vote['vote_type'] == vote_type:
-                    # Same vote - remove it (toggle off)
-                    delete_query = "DELETE FROM votes WHERE id = $1"
-                    await conn.execute(delete_query, existing_vote['id'])
-                    return None
-                else:
-                    # Different vote - update it
-                    update_query = """
-                        UPDATE votes SET vote_type = $1, updated_at = NOW()
-                        WHERE id = $2
+            async with conn.transaction():
+                # Same vote removes it, a different vote switches it, no vote adds one
+                vote_query = """
+                    WITH existing AS (
+                        SELECT id, vote_type FROM votes WHERE post_id = $1 AND user_id = $2
+                    ),
+                    removed AS (
+                        DELETE FROM votes
+                        WHERE id IN (SELECT id FROM existing WHERE vote_type = $3::vote_type)
+                    ),
+                    changed AS (
+                        UPDATE votes SET vote_type = $3::vote_type, updated_at = NOW()
+                        WHERE id IN (SELECT id FROM existing WHERE vote_type <> $3::vote_type)
                         RETURNING id, post_id, user_id, vote_type, created_at, updated_at
-                    """
-                    row = await conn.fetchrow(update_query, vote_type, existing_vote['id'])
-                    return dict(row)
-            else:
-                # New vote
-                vote_id = uuid4()
-                insert_query = """
-                    INSERT INTO votes (id, post_id, user_id, vote_type)
-                    VALUES ($1, $2, $3, $4)
-                    RETURNING id, post_id, user_id, vote_type, created_at, updated_at
+                    ),
+                    added AS (
+                        INSERT INTO votes (id, post_id, user_id, vote_type)
+                        SELECT $4, $1, $2, $3::vote_type
+                        WHERE NOT EXISTS (SELECT 1 FROM existing)
+                        ON CONFLICT ON CONSTRAINT unique_post_vote DO NOTHING
+                        RETURNING id, post_id, user_id, vote_type, created_at, updated_at
+                    )
+                    SELECT * FROM changed
+                    UNION ALL
+                    SELECT * FROM added
                 """
-                row = await conn.fetchrow(insert_query, vote_id, post_id, user_id, vote_type)
-                return dict(row)
+                row = await conn.fetchrow(vote_query, post_id, user_id, vote_type, uuid4())
+                
+                # Counter triggers have run by now; read them on the same connection
+                counts_row = await conn.fetchrow(
+                    "SELECT upvotes, downvotes FROM posts WHERE id = $1", post_id
+                )
+            
+            vote_counts = dict(counts_row) if counts_row else {"upvotes": 0, "downvotes": 0}
+            return (dict(row) if row else None), vote_counts
+    
+    async def get_post_counts(self, post_id: UUID) -> Dict[str, int]:
+        """Get a post's upvotes, downvotes and comment_count"""
+        async with db_manager.get_connection() as conn:
+            # Counters are maintained by triggers on votes and comments (see 006_post_engagement_counters.sql)
+            query = "SELECT upvotes, downvotes, comment_count FROM posts WHERE id = $1"
+            row = await conn.fetchrow(query, post_id)
+            return dict(row) if row else {"upvotes": 0, "downvotes": 0, "comment_count": 0}
     
     async def get_post_vote_counts(self, post_id: UUID) -> Dict[str, int]:
         """Get vote counts for a post"""
-        async with db_manager.get_connection() as conn:
-            query = """
-                SELECT vote_type, COUNT(*) as count
-                FROM votes 
-                WHERE post_id = $1 
-                GROUP BY vote_type
-            """
-            rows = await conn.fetch(query, post_id)
-            
-            vote_counts = {"upvotes": 0, "downvotes": 0}
-            for row in rows:
-                if row['vote_type'] == 'upvote':
-                    vote_counts["upvotes"] = row['count']
-                elif row['vote_type'] == 'downvote':
-                    vote_counts["downvotes"] = row['count']
-            
-            return vote_counts
+        counts = await self.get_post_counts(post_id)
+        return {"upvotes": counts["upvotes"], "downvotes": counts["downvotes"]}
     
     async def get_user_vote_on_post(self, post_id: UUID, user_id: UUID) -> Optional[Dict[str, Any]]:
         """Get user's vote on a specific post"""
@@ -764,6 +942,17 @@ class DatabaseService:
             row = await conn.fetchrow(query, post_id, user_id)
             return dict(row) if row else None
     
+    async def get_user_votes_bulk(self, post_ids: List[UUID], user_id: UUID) -> Dict[UUID, str]:
+        """Get a user's vote type on several posts in one query"""
+        async with db_manager.get_connection() as conn:
+            query = """
+                SELECT post_id, vote_type
+                FROM votes
+                WHERE post_id = ANY($1::uuid[]) AND user_id = $2
+            """
+            rows = await conn.fetch(query, post_ids, user_id)
+            return {row['post_id']: row['vote_type'] for row in rows}
+    
     # Comment operations
     async def create_comment(self, comment_data: Dict[str, Any], user_id: UUID) -> Dict[str, Any]:
         """Create a new comment"""
@@ -1022,10 +1211,8 @@ class DatabaseService:
 
     async def get_comments_count_by_post(self, post_id: UUID) -> int:
         """Get total count of comments for a post"""
-        async with db_manager.get_connection() as conn:
-            query = "SELECT COUNT(*) as count FROM comments WHERE post_id = $1"
-            row = await conn.fetchrow(query, post_id)
-            return row['count'] if row else 0
+        counts = await self.get_post_counts(post_id)
+        return counts["comment_count"]
 
     async def update_comment(self, comment_id: UUID, update_data: Dict[str, Any], user_id: UUID) -> Optional[Dict[str, Any]]:
         """Update a comment (only by the comment author)"""
@@ -1237,9 +1424,15 @@ class DatabaseService:
     async def is_post_saved(self, post_id: UUID, user_id: UUID) -> bool:
         """Check if a post is saved by a user"""
         async with db_manager.get_connection() as conn:
-            query = "SELECT 1 FROM saved_posts WHERE post_id = $1 AND user_id = $2"
-            row = await conn.fetchrow(query, post_id, user_id)
-            return row is not None
+            query = "SELECT EXISTS (SELECT 1 FROM saved_posts WHERE user_id = $1 AND post_id = $2)"
+            return await conn.fetchval(query, user_id, post_id)
+    
+    async def is_post_saved_bulk(self, post_ids: List[UUID], user_id: UUID) -> Set[UUID]:
+        """Get which of the given posts are saved by a user"""
+        async with db_manager.get_connection() as conn:
+            query = "SELECT post_id FROM saved_posts WHERE post_id = ANY($1::uuid[]) AND user_id = $2"
+            rows = await conn.fetch(query, post_ids, user_id)
+            return {row['post_id'] for row in rows}
     
     # Analytics and aggregations
     async def get_user_stats(self, user_id: UUID) -> Dict[str, int]:
@@ -1257,35 +1450,67 @@ class DatabaseService:
             return dict(row)
     
     async def get_trending_posts(self, hours: int = 24, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get trending posts based on engagement in the last N hours including author rep_accounts"""
+        """Get trending posts; the ranking is served from the trending cache when possible"""
+        key = (hours, limit)
+        post_ids = _get_cached_trending(key)
+        if post_ids is None:
+            # Single flight: concurrent misses wait for the first one instead of re-running the ranking
+            lock = _trending_locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                post_ids = _get_cached_trending(key)
+                if post_ids is None:
+                    post_ids = await self._rank_trending_post_ids(hours, limit)
+                    _cache_trending(key, post_ids)
+        
+        # Counters are read fresh for the page rather than frozen with the ranking
+        return await self._fetch_trending_posts(post_ids)
+    
+    async def _rank_trending_post_ids(self, hours: int, limit: int) -> List[UUID]:
+        """Rank post ids by engagement in the last N hours"""
         async with db_manager.get_connection() as conn:
             query = """
-                SELECT p.id, p.title, p.content, p.post_type, p.media_urls, p.location, p.tags,
-                       p.created_at, p.updated_at,
-                       u.id as user_id, u.username as author_username, 
-                       u.display_name as author_display_name, u.avatar_url as author_avatar_url,
-                       u.rep_accounts,
-                       (COALESCE(vote_count, 0) + COALESCE(comment_count, 0)) as engagement_score
+                SELECT p.id
                 FROM posts p
-                JOIN users u ON p.user_id = u.id
                 LEFT JOIN (
                     SELECT post_id, COUNT(*) as vote_count
                     FROM votes 
-                    WHERE created_at >= NOW() - INTERVAL '%s hours'
+                    WHERE created_at >= NOW() - $2::int * INTERVAL '1 hour'
                     GROUP BY post_id
                 ) v ON p.id = v.post_id
                 LEFT JOIN (
                     SELECT post_id, COUNT(*) as comment_count
                     FROM comments 
-                    WHERE created_at >= NOW() - INTERVAL '%s hours'
+                    WHERE created_at >= NOW() - $2::int * INTERVAL '1 hour'
                     GROUP BY post_id
                 ) c ON p.id = c.post_id
-                WHERE p.created_at >= NOW() - INTERVAL '%s hours'
-                ORDER BY engagement_score DESC, p.created_at DESC
+                WHERE p.created_at >= NOW() - $2::int * INTERVAL '1 hour'
+                ORDER BY (COALESCE(v.vote_count, 0) + COALESCE(c.comment_count, 0)) DESC, p.created_at DESC
                 LIMIT $1
-            """ % (hours, hours, hours)
+            """
             
-            rows = await conn.fetch(query, limit)
+            # The window is a bind parameter so every `hours` value reuses one cached prepared statement
+            rows = await conn.fetch(query, limit, hours)
+            return [row['id'] for row in rows]
+    
+    async def _fetch_trending_posts(self, post_ids: List[UUID]) -> List[Dict[str, Any]]:
+        """Get ranked trending posts by id, in ranking order, including author rep_accounts"""
+        if not post_ids:
+            return []
+        
+        async with db_manager.get_connection() as conn:
+            query = """
+                SELECT p.id, p.title, p.content, p.post_type, COALESCE(p.media_urls, '{}') as media_urls, p.location, p.tags,
+                       p.upvotes, p.downvotes, p.comment_count,
+                       p.created_at, p.updated_at,
+                       u.id as user_id, u.username as author_username, 
+                       u.display_name as author_display_name, u.avatar_url as author_avatar_url,
+                       u.rep_accounts
+                FROM posts p
+                JOIN users u ON p.user_id = u.id
+                WHERE p.id = ANY($1::uuid[])
+                ORDER BY array_position($1::uuid[], p.id)
+            """
+            rows = await conn.fetch(query, post_ids)
             
             # Get unique user IDs to fetch rep_accounts for all authors
             user_ids = list(set([row['user_id'] for row in rows]))
@@ -1347,8 +1572,7 @@ class DatabaseService:
                     'rep_accounts': user_rep_accounts.get(author_user_id, [])
                 }
                 
-                # Remove internal scoring field and rep_accounts field at post level
-                post.pop('engagement_score', None)
+                # Remove rep_accounts field at post level
                 post.pop('rep_accounts', None)
                 
                 posts.append(post)
@@ -1639,3 +1863,28 @@ class DatabaseService:
                 'is_followed_by': is_followed_by,
                 'mutual': mutual
             }
+
+    async def check_follow_status_bulk(self, follower_id: UUID, followed_ids: List[UUID]) -> Dict[UUID, Dict[str, Any]]:
+        """Check follow status between one user and several others in one query"""
+        async with db_manager.get_connection() as conn:
+            query = """
+                SELECT t.user_id,
+                       f.follower_id IS NOT NULL as is_following,
+                       fb.follower_id IS NOT NULL as is_followed_by,
+                       COALESCE(f.mutual, FALSE) as mutual
+                FROM unnest($2::uuid[]) as t(user_id)
+                LEFT JOIN follows f ON f.follower_id = $1 AND f.followed_id = t.user_id
+                LEFT JOIN follows fb ON fb.follower_id = t.user_id AND fb.followed_id = $1
+            """
+            rows = await conn.fetch(query, follower_id, followed_ids)
+            return {
+                row['user_id']: {
+                    'is_following': row['is_following'],
+                    'is_followed_by': row['is_followed_by'],
+                    'mutual': row['mutual']
+                }
+                for row in rows
+            }
+
+# Global database service instance
+db_service = DatabaseService()
@@ -5,7 +5,7 @@ import logging
 from typing import Dict, Any
 from uuid import UUID
 from fastapi import HTTPException
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +13,7 @@ class FollowService:
     """Service for follow-related operations"""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
     
     async def follow_user(self, follower_id: UUID, followed_id: UUID) -> Dict[str, Any]:
         """Follow a user"""
@@ -1,7 +1,7 @@
 from typing import List, Dict, Any, Optional
 import random
 import math
-from app.services.post_service import PostService
+from app.services.post_service import post_service
 from app.services.news_service import news_service
 from app.schemas import PaginatedResponse
 from app.core.config import settings
@@ -14,7 +14,7 @@ class MixedContentService:
     """Service for mixing posts and news content with configurable ratios"""
     
     def __init__(self):
-        self.post_service = PostService()
+        self.post_service = post_service
         self.news_service = news_service
         
     async def get_mixed_content(
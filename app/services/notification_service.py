@@ -5,19 +5,108 @@ Handles notification creation, delivery via WebSocket, and persistence
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import os
+import socket
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Set, Any
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
+
+import orjson
 
 from app.websocket.connection_manager import connection_manager
+from app.db.redis_client import redis_manager
 from app.models.pydantic_models import NotificationType, NotificationResponse
 from app.core.logging_config import get_logger
 
 logger = get_logger('app.notifications')
 
+# Maximum notifications buffered per offline user
+MAX_PENDING_NOTIFICATIONS = 50
+
+# Redis keys used when notifications are fanned out across worker processes
+NOTIFICATION_CHANNEL_PREFIX = "notif:user:"
+PENDING_KEY_PREFIX = "notif:pending:"
+PRESENCE_KEY_PREFIX = "notif:presence:"
+
+# Presence is a sorted set of "<worker>:<connection_id>" members scored by last-seen time.
+# Workers refresh their entries every heartbeat; entries not seen within the TTL
+# (e.g. from a crashed worker) are ignored and pruned.
+PRESENCE_HEARTBEAT_SECONDS = 30
+PRESENCE_TTL_SECONDS = 90
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Maximum number of detached notification sends running at once
+MAX_CONCURRENT_SENDS = 256
+
+class _CoarseClock:
+    """
+    Caches the JSON-encoded current UTC timestamp, refreshing it at most every
+    `resolution` seconds. Envelope timestamps don't need sub-millisecond precision.
+    """
+    
+    __slots__ = ("resolution", "_expires_at", "_encoded")
+    
+    def __init__(self, resolution: float = 0.05):
+        self.resolution = resolution
+        self._expires_at = 0.0
+        self._encoded = b""
+    
+    def now_json(self) -> bytes:
+        """Get the current UTC time as a JSON-encoded ISO string"""
+        now = time.monotonic()
+        if now >= self._expires_at:
+            self._encoded = orjson.dumps(datetime.utcnow().isoformat())
+            self._expires_at = now + self.resolution
+        return self._encoded
+
+_envelope_clock = _CoarseClock()
+
+class _UUID7Generator:
+    """
+    Generates time-ordered UUIDv7 values, drawing random bits from a pooled
+    os.urandom buffer instead of one syscall per ID
+    """
+    
+    __slots__ = ("pool_size", "_pool", "_offset")
+    
+    _RANDOM_BYTES = 10  # 12 bits rand_a + 62 bits rand_b, rounded up to whole bytes
+    
+    def __init__(self, pool_size: int = 4096):
+        self.pool_size = pool_size
+        self._pool = b""
+        self._offset = 0
+    
+    def __call__(self) -> UUID:
+        if self._offset + self._RANDOM_BYTES > len(self._pool):
+            self._pool = os.urandom(self.pool_size)
+            self._offset = 0
+        
+        rand = int.from_bytes(self._pool[self._offset:self._offset + self._RANDOM_BYTES], "big")
+        self._offset += self._RANDOM_BYTES
+        
+        unix_ms = time.time_ns() // 1_000_000
+        value = (
+            (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+            | 0x7 << 76                          # version 7
+            | ((rand >> 62) & 0xFFF) << 64       # rand_a
+            | 0b10 << 62                         # RFC 4122 variant
+            | (rand & 0x3FFF_FFFF_FFFF_FFFF)     # rand_b
+        )
+        return UUID(int=value)
+
+_new_notification_id = _UUID7Generator()
+
 class NotificationEvent:
     """Represents a real-time notification event"""
     
+    __slots__ = (
+        "id", "user_id", "notification_type", "title", "message", "post_id",
+        "comment_id", "triggered_by_user_id", "action_url", "metadata",
+        "created_at", "_read", "_json_bytes"
+    )
+    
     def __init__(
         self,
         user_id: UUID,
@@ -28,9 +117,10 @@ class NotificationEvent:
         comment_id: Optional[UUID] = None,
         triggered_by_user_id: Optional[UUID] = None,
         action_url: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        created_at: Optional[datetime] = None
     ):
-        self.id = uuid4()
+        self.id = _new_notification_id()
         self.user_id = user_id
         self.notification_type = notification_type
         self.title = title
@@ -40,8 +130,18 @@ class NotificationEvent:
         self.triggered_by_user_id = triggered_by_user_id
         self.action_url = action_url
         self.metadata = metadata or {}
-        self.created_at = datetime.utcnow()
-        self.read = False
+        self.created_at = created_at or datetime.utcnow()
+        self._read = False
+        self._json_bytes: Optional[bytes] = None
+
+    @property
+    def read(self) -> bool:
+        return self._read
+
+    @read.setter
+    def read(self, value: bool):
+        self._read = value
+        self._json_bytes = None  # Re-serialize with the new read state
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert notification to dictionary for JSON serialization"""
@@ -60,61 +160,138 @@ class NotificationEvent:
             "read": self.read
         }
 
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize notification to JSON bytes, cached after the first call
+        Setting `read` clears the cache; other fields are not changed once sent
+        """
+        if self._json_bytes is None:
+            # orjson encodes UUIDs and datetimes natively, so skip the str() conversions
+            self._json_bytes = orjson.dumps({
+                "id": self.id,
+                "user_id": self.user_id,
+                "notification_type": self.notification_type.value,
+                "title": self.title,
+                "message": self.message,
+                "post_id": self.post_id,
+                "comment_id": self.comment_id,
+                "triggered_by_user_id": self.triggered_by_user_id,
+                "action_url": self.action_url,
+                "metadata": self.metadata,
+                "created_at": self.created_at,
+                "read": self._read
+            })
+        return self._json_bytes
+
 class RealTimeNotificationService:
     """Manages real-time notifications via WebSocket"""
     
     def __init__(self):
-        self.pending_notifications: Dict[str, List[NotificationEvent]] = {}
-        self.user_connections: Dict[str, List[str]] = {}  # user_id -> [connection_ids]
-        
+        self.pending_notifications: Dict[str, Deque[NotificationEvent]] = {}
+        self._backplane_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._send_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        self._inflight: Set[asyncio.Task] = set()
+
+    def enqueue(self, notification: NotificationEvent) -> asyncio.Task:
+        """
+        Schedule a notification send in the background so request handlers
+        don't wait on WebSocket delivery
+        """
+        task = asyncio.create_task(self._send_with_semaphore(notification))
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        return task
+
+    async def _send_with_semaphore(self, notification: NotificationEvent) -> bool:
+        """Send a notification, bounding the number of concurrent background sends"""
+        async with self._send_semaphore:
+            return await self.send_notification(notification)
+
     async def send_notification(self, notification: NotificationEvent) -> bool:
         """
         Send a notification to a user via WebSocket
         Falls back to storing for later delivery if user not connected
         """
         try:
+            if redis_manager.is_enabled():
+                return await self._publish(notification)
+            
             user_id_str = str(notification.user_id)
             
-            # Get active connections for this user
+            # Offline users are the common case during bursts: store without further work
+            if user_id_str not in connection_manager.user_index:
+                await self._store_for_later_delivery(notification)
+                logger.info(f"User {user_id_str} not connected, notification stored for later delivery")
+                return False
+            
+            # Send to all user's active connections, serializing once
             user_connections = await self._get_user_connections(user_id_str)
+            success_count = await self._broadcast_raw(user_connections, self._encode_message(notification))
             
-            if user_connections:
-                # Send to all user's active connections
-                success_count = 0
-                for connection_id in user_connections:
-                    success = await self._send_to_connection(connection_id, notification)
-                    if success:
-                        success_count += 1
-                
-                logger.info(
-                    f"Notification sent to {success_count}/{len(user_connections)} connections "
-                    f"for user {user_id_str}: {notification.notification_type.value}"
-                )
-                return success_count > 0
-            else:
-                # Store for later delivery
+            if success_count == 0:
                 await self._store_for_later_delivery(notification)
-                logger.info(f"User {user_id_str} not connected, notification stored for later delivery")
+                logger.info(f"Delivery to user {user_id_str} failed, notification stored for later delivery")
                 return False
+            
+            logger.info(
+                f"Notification sent to {success_count}/{len(user_connections)} connections "
+                f"for user {user_id_str}: {notification.notification_type.value}"
+            )
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to send notification: {e}")
             return False
 
     async def send_bulk_notifications(self, notifications: List[NotificationEvent]) -> Dict[str, int]:
-        """Send multiple notifications efficiently"""
+        """
+        Send multiple notifications efficiently
+        Connections are resolved once per recipient and each payload is serialized once
+        """
         results = {"sent": 0, "stored": 0, "failed": 0}
         
+        if redis_manager.is_enabled():
+            for notification in notifications:
+                try:
+                    if await self._publish(notification):
+                        results["sent"] += 1
+                    else:
+                        results["stored"] += 1
+                except Exception as e:
+                    logger.error(f"Failed to publish bulk notification: {e}")
+                    results["failed"] += 1
+            return results
+        
+        by_user: Dict[str, List[NotificationEvent]] = defaultdict(list)
         for notification in notifications:
+            by_user[str(notification.user_id)].append(notification)
+        
+        for user_id_str, user_notifications in by_user.items():
             try:
-                success = await self.send_notification(notification)
-                if success:
-                    results["sent"] += 1
-                else:
-                    results["stored"] += 1
+                user_connections = await self._get_user_connections(user_id_str)
             except Exception as e:
-                logger.error(f"Failed to send bulk notification: {e}")
-                results["failed"] += 1
+                logger.error(f"Failed to resolve connections for user {user_id_str}: {e}")
+                results["failed"] += len(user_notifications)
+                continue
+            
+            for notification in user_notifications:
+                try:
+                    if user_connections:
+                        payload = self._encode_message(notification)
+                        success_count = await self._broadcast_raw(user_connections, payload)
+                        if success_count > 0:
+                            results["sent"] += 1
+                        else:
+                            await self._store_for_later_delivery(notification)
+                            results["stored"] += 1
+                    else:
+                        await self._store_for_later_delivery(notification)
+                        results["stored"] += 1
+                except Exception as e:
+                    logger.error(f"Failed to send bulk notification: {e}")
+                    results["failed"] += 1
         
         return results
 
@@ -129,6 +306,13 @@ class RealTimeNotificationService:
         """Notify followers about post updates"""
         notifications = []
         
+        # Fields shared by every follower's notification
+        title = "Post Update"
+        message = f'"{post_title}" has been {update_type}'
+        action_url = f"/posts/{post_id}"
+        metadata = {"update_type": update_type}
+        created_at = datetime.utcnow()
+        
         for user_id in followers:
             # Don't notify the user who made the update
             if triggered_by_user_id and user_id == triggered_by_user_id:
@@ -137,12 +321,13 @@ class RealTimeNotificationService:
             notification = NotificationEvent(
                 user_id=user_id,
                 notification_type=NotificationType.ISSUE_UPDATE,
-                title=f"Post Update",
-                message=f'"{post_title}" has been {update_type}',
+                title=title,
+                message=message,
                 post_id=post_id,
                 triggered_by_user_id=triggered_by_user_id,
-                action_url=f"/posts/{post_id}",
-                metadata={"update_type": update_type}
+                action_url=action_url,
+                metadata=metadata,
+                created_at=created_at
             )
             notifications.append(notification)
         
@@ -172,20 +357,22 @@ class RealTimeNotificationService:
         )
         notifications.append(notification)
         
-        # Notify mentioned users
-        if mentioned_users:
-            for user_id in mentioned_users:
-                if user_id != post_author_id:  # Don't duplicate notification
-                    notification = NotificationEvent(
-                        user_id=user_id,
-                        notification_type=NotificationType.MENTION,
-                        title="You were mentioned",
-                        message=f'{commenter_name} mentioned you in a comment on "{post_title}"',
-                        post_id=post_id,
-                        comment_id=comment_id,
-                        action_url=f"/posts/{post_id}#comment-{comment_id}"
-                    )
-                    notifications.append(notification)
+        # Notify mentioned users once each, skipping the post author who is already notified
+        recipients = frozenset(mentioned_users or ()) - {post_author_id}
+        if recipients:
+            message = f'{commenter_name} mentioned you in a comment on "{post_title}"'
+            action_url = f"/posts/{post_id}#comment-{comment_id}"
+            for user_id in recipients:
+                notification = NotificationEvent(
+                    user_id=user_id,
+                    notification_type=NotificationType.MENTION,
+                    title="You were mentioned",
+                    message=message,
+                    post_id=post_id,
+                    comment_id=comment_id,
+                    action_url=action_url
+                )
+                notifications.append(notification)
         
         return await self.send_bulk_notifications(notifications)
 
@@ -197,7 +384,7 @@ class RealTimeNotificationService:
         voter_name: str,
         vote_type: str
     ):
-        """Notify about votes on posts"""
+        """Notify about votes on posts; delivery happens in the background"""
         notification = NotificationEvent(
             user_id=post_author_id,
             notification_type=NotificationType.VOTE,
@@ -208,7 +395,7 @@ class RealTimeNotificationService:
             metadata={"vote_type": vote_type}
         )
         
-        return await self.send_notification(notification)
+        return self.enqueue(notification)
 
     async def notify_assignment(
         self,
@@ -217,7 +404,7 @@ class RealTimeNotificationService:
         assignee_id: UUID,
         assigner_name: str
     ):
-        """Notify about post assignments"""
+        """Notify about post assignments; delivery happens in the background"""
         notification = NotificationEvent(
             user_id=assignee_id,
             notification_type=NotificationType.ASSIGNMENT,
@@ -227,58 +414,217 @@ class RealTimeNotificationService:
             action_url=f"/posts/{post_id}",
         )
         
-        return await self.send_notification(notification)
+        return self.enqueue(notification)
 
     async def _get_user_connections(self, user_id: str) -> List[str]:
         """Get all active WebSocket connections for a user"""
-        # Integration with your existing connection manager
-        connections = []
-        for connection_id, connection_info in connection_manager.connections.items():
-            if connection_info.user_id == user_id:
-                connections.append(connection_id)
-        return connections
-
-    async def _send_to_connection(self, connection_id: str, notification: NotificationEvent) -> bool:
-        """Send notification to a specific WebSocket connection"""
-        try:
-            message = {
-                "event_type": "notification",
-                "data": notification.to_dict(),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Use your existing connection manager
-            return await connection_manager._send_to_connection(connection_id, message)
-            
-        except Exception as e:
-            logger.error(f"Failed to send to connection {connection_id}: {e}")
-            return False
+        return list(connection_manager.user_index.get(user_id, ()))
+
+    def _encode_message(self, notification: NotificationEvent) -> bytes:
+        """Wrap the cached notification payload in the WebSocket message envelope"""
+        return self._wrap_payload(notification.to_json_bytes())
+
+    def _wrap_payload(self, data: bytes) -> bytes:
+        """Build the WebSocket message envelope around serialized notification data"""
+        return (
+            b'{"event_type":"notification","data":'
+            + data
+            + b',"timestamp":'
+            + _envelope_clock.now_json()
+            + b'}'
+        )
+
+    async def _broadcast_raw(self, connection_ids: List[str], payload: bytes) -> int:
+        """Send an already-serialized payload to several connections"""
+        results = await asyncio.gather(
+            *(connection_manager._send_bytes(connection_id, payload) for connection_id in connection_ids),
+            return_exceptions=True
+        )
+        return sum(1 for sent in results if sent is True)
 
     async def _store_for_later_delivery(self, notification: NotificationEvent):
         """Store notification for later delivery when user comes online"""
         user_id_str = str(notification.user_id)
         
-        if user_id_str not in self.pending_notifications:
-            self.pending_notifications[user_id_str] = []
+        if redis_manager.is_enabled():
+            await self._store_raw_for_later_delivery(user_id_str, [notification.to_json_bytes()])
+            return
         
-        self.pending_notifications[user_id_str].append(notification)
+        # Bounded deque keeps only the most recent notifications per user
+        self.pending_notifications.setdefault(
+            user_id_str, deque(maxlen=MAX_PENDING_NOTIFICATIONS)
+        ).append(notification)
+
+    async def _store_raw_for_later_delivery(self, user_id: str, stored: List[bytes], front: bool = False):
+        """Store serialized notification data on the Redis backplane, oldest first"""
+        redis = redis_manager.get_client()
         
-        # Keep only last 50 notifications per user to prevent memory issues
-        if len(self.pending_notifications[user_id_str]) > 50:
-            self.pending_notifications[user_id_str] = self.pending_notifications[user_id_str][-50:]
+        # Capped list shared by all workers, trimmed atomically server-side
+        key = PENDING_KEY_PREFIX + user_id
+        async with redis.pipeline(transaction=True) as pipe:
+            if front:
+                # Undelivered notifications go back ahead of anything stored meanwhile
+                pipe.lpush(key, *reversed(stored))
+            else:
+                pipe.rpush(key, *stored)
+            pipe.ltrim(key, -MAX_PENDING_NOTIFICATIONS, -1)
+            await pipe.execute()
 
     async def deliver_pending_notifications(self, user_id: str, connection_id: str):
         """Deliver pending notifications when user connects"""
-        if user_id in self.pending_notifications:
-            notifications = self.pending_notifications[user_id]
-            
-            logger.info(f"Delivering {len(notifications)} pending notifications to user {user_id}")
-            
-            for notification in notifications:
-                await self._send_to_connection(connection_id, notification)
-            
-            # Clear delivered notifications
-            del self.pending_notifications[user_id]
+        redis = redis_manager.get_client()
+        if redis is not None:
+            key = PENDING_KEY_PREFIX + user_id
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.lrange(key, 0, -1)
+                pipe.delete(key)
+                stored, _ = await pipe.execute()
+            payloads = [self._wrap_payload(data) for data in stored]
+        else:
+            # Remove the buffer so delivered users don't leave empty entries behind
+            stored = list(self.pending_notifications.pop(user_id, None) or ())
+            # Serialize each notification once
+            payloads = [self._encode_message(notification) for notification in stored]
+        
+        if not payloads:
+            return
+        
+        logger.info(f"Delivering {len(payloads)} pending notifications to user {user_id}")
+        
+        # Sends on one connection are written in order, so these queue up behind each other
+        results = await asyncio.gather(
+            *(connection_manager._send_bytes(connection_id, payload) for payload in payloads),
+            return_exceptions=True
+        )
+        
+        undelivered = [item for item, sent in zip(stored, results) if sent is not True]
+        if not undelivered:
+            return
+        
+        logger.info(f"{len(undelivered)} pending notifications for user {user_id} not delivered, storing again")
+        if redis is not None:
+            await self._store_raw_for_later_delivery(user_id, undelivered, front=True)
+        else:
+            # Undelivered notifications go back ahead of anything stored meanwhile
+            self.pending_notifications[user_id] = deque(
+                [*undelivered, *self.pending_notifications.get(user_id, ())],
+                maxlen=MAX_PENDING_NOTIFICATIONS
+            )
+
+    async def _publish(self, notification: NotificationEvent) -> bool:
+        """
+        Publish a notification on the Redis backplane so whichever worker holds
+        the user's connections delivers it. Stores it if the user is offline.
+        """
+        redis = redis_manager.get_client()
+        user_id_str = str(notification.user_id)
+        
+        if await self._is_online(redis, user_id_str):
+            # Only count it as delivered if some worker was listening for it
+            receivers = await redis.publish(NOTIFICATION_CHANNEL_PREFIX + user_id_str, notification.to_json_bytes())
+            if receivers > 0:
+                return True
+            logger.warning(f"No backplane listener received notification for user {user_id_str}")
+        
+        await self._store_for_later_delivery(notification)
+        logger.info(f"User {user_id_str} not connected, notification stored for later delivery")
+        return False
+
+    async def _is_online(self, redis, user_id: str) -> bool:
+        """Check for live presence entries for a user, pruning stale ones"""
+        key = PRESENCE_KEY_PREFIX + user_id
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(key, "-inf", time.time() - PRESENCE_TTL_SECONDS)
+            pipe.zcard(key)
+            _, count = await pipe.execute()
+        return count > 0
+
+    async def track_presence(self, user_id: str, connection_id: str, connected: bool):
+        """Record a user's connection opening or closing on the Redis backplane"""
+        redis = redis_manager.get_client()
+        if redis is None:
+            return
+        
+        try:
+            key = PRESENCE_KEY_PREFIX + user_id
+            member = f"{WORKER_ID}:{connection_id}"
+            async with redis.pipeline(transaction=True) as pipe:
+                if connected:
+                    pipe.zadd(key, {member: time.time()})
+                    pipe.expire(key, PRESENCE_TTL_SECONDS)
+                else:
+                    pipe.zrem(key, member)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to update presence for user {user_id}: {e}")
+
+    async def _heartbeat_presence(self):
+        """Background task refreshing presence entries for this worker's connections"""
+        while True:
+            await asyncio.sleep(PRESENCE_HEARTBEAT_SECONDS)
+            try:
+                user_index = connection_manager.user_index
+                if not user_index:
+                    continue
+                
+                now = time.time()
+                redis = redis_manager.get_client()
+                async with redis.pipeline(transaction=False) as pipe:
+                    for user_id, connection_ids in list(user_index.items()):
+                        key = PRESENCE_KEY_PREFIX + user_id
+                        pipe.zadd(key, {f"{WORKER_ID}:{connection_id}": now for connection_id in connection_ids})
+                        pipe.expire(key, PRESENCE_TTL_SECONDS)
+                    await pipe.execute()
+                    
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error refreshing notification presence: {e}")
+
+    def start_backplane(self):
+        """Start routing notifications published by any worker to local connections"""
+        if redis_manager.is_enabled() and self._backplane_task is None:
+            self._backplane_task = asyncio.create_task(self._listen_backplane())
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_presence())
+            logger.info("Notification backplane listener started")
+
+    async def stop_backplane(self):
+        """Stop the backplane listener"""
+        if self._backplane_task is not None:
+            self._backplane_task.cancel()
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._backplane_task, self._heartbeat_task, return_exceptions=True)
+            self._backplane_task = None
+            self._heartbeat_task = None
+            logger.info("Notification backplane listener stopped")
+
+    async def _listen_backplane(self):
+        """Background task delivering published notifications to this worker's connections"""
+        while True:
+            try:
+                pubsub = redis_manager.get_client().pubsub()
+                await pubsub.psubscribe(NOTIFICATION_CHANNEL_PREFIX + "*")
+                
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode("utf-8")
+                    user_id = channel[len(NOTIFICATION_CHANNEL_PREFIX):]
+                    
+                    connection_ids = await self._get_user_connections(user_id)
+                    if connection_ids:
+                        success_count = await self._broadcast_raw(connection_ids, self._wrap_payload(message["data"]))
+                        if success_count == 0:
+                            await self._store_raw_for_later_delivery(user_id, [message["data"]])
+                        
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in notification backplane listener: {e}")
+                await asyncio.sleep(5)
 
 # Global notification service instance
 notification_service = RealTimeNotificationService()
@@ -5,13 +5,14 @@ This service handles all permission-related database operations and business log
 for the dynamic permission system based on API routes.
 """
 
-from typing import List, Optional, Set, Dict
+from typing import List, Optional, Set, Dict, Tuple
 from uuid import UUID
 import logging
+import time
 
-from sqlalchemy import select, and_, or_, text
+from sqlalchemy import select, delete, and_, or_, text, literal, bindparam
+from sqlalchemy.dialects.postgresql import insert, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.db.database import get_db
 from app.models.permission import APIPermission, SystemRole, UserRole, RoleAPIPermission
@@ -19,12 +20,59 @@ from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Permission check results are cached briefly to avoid repeated lookups. The cache is per
+# worker and role changes only clear the handling worker's entries, so the TTL bounds how
+# long other workers may keep honouring a revoked role.
+PERMISSION_CACHE_TTL_SECONDS = 5
+PERMISSION_CACHE_MAX_ENTRIES = 10_000
+
+# Built once at import so hot-path role lookups reuse the compiled statement
+_USER_ROLES_STMT = (
+    select(SystemRole)
+    .join(UserRole, SystemRole.id == UserRole.role_id)
+    .where(UserRole.user_id == bindparam("user_id"))
+    .where(SystemRole.is_active == True)
+)
+
 class PermissionService:
     """Service for managing permissions and roles"""
     
     def __init__(self):
         self._role_cache: Dict[str, List[str]] = {}
-        self._permission_cache: Dict[str, bool] = {}
+        # (user_id, permission_name) -> (has_permission, expires_at)
+        self._permission_cache: Dict[Tuple[UUID, str], Tuple[bool, float]] = {}
+    
+    def _get_cached_permission(self, user_id: UUID, permission_name: str) -> Optional[bool]:
+        """Return a cached permission check result if it has not expired"""
+        key = (user_id, permission_name)
+        entry = self._permission_cache.get(key)
+        if entry is None:
+            return None
+        
+        has_permission, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._permission_cache.pop(key, None)
+            return None
+        
+        return has_permission
+    
+    def _cache_permission(self, user_id: UUID, permission_name: str, has_permission: bool):
+        """Cache a permission check result"""
+        if len(self._permission_cache) >= PERMISSION_CACHE_MAX_ENTRIES:
+            # Drop the oldest 25% of entries
+            items_to_remove = len(self._permission_cache) // 4
+            for key in list(self._permission_cache.keys())[:items_to_remove]:
+                del self._permission_cache[key]
+        
+        self._permission_cache[(user_id, permission_name)] = (
+            has_permission,
+            time.monotonic() + PERMISSION_CACHE_TTL_SECONDS
+        )
+    
+    def invalidate_user_permissions(self, user_id: UUID):
+        """Drop cached permission results for a user"""
+        for key in [key for key in self._permission_cache if key[0] == user_id]:
+            del self._permission_cache[key]
     
     async def user_has_permission(
         self, 
@@ -41,20 +89,35 @@ class PermissionService:
         Returns:
             True if user has permission, False otherwise
         """
+        cached = self._get_cached_permission(user_id, permission_name)
+        if cached is not None:
+            return cached
+        
         async with get_db_session() as db:
             try:
-                # Get user roles
-                user_roles = await self.get_user_roles(user_id, db)
-                
-                if not user_roles:
-                    return False
+                # Single existence check across roles and permissions
+                query = (
+                    select(literal(1))
+                    .select_from(UserRole)
+                    .join(SystemRole, UserRole.role_id == SystemRole.id)
+                    .join(RoleAPIPermission, RoleAPIPermission.role_id == UserRole.role_id)
+                    .join(APIPermission, RoleAPIPermission.api_permission_id == APIPermission.id)
+                    .where(
+                        and_(
+                            UserRole.user_id == user_id,
+                            APIPermission.permission_name == permission_name,
+                            APIPermission.is_active == True,
+                            SystemRole.is_active == True,
+                            RoleAPIPermission.granted == True
+                        )
+                    )
+                    .limit(1)
+                )
                 
-                # Check if any role has this permission
-                for role in user_roles:
-                    if await self._role_has_permission(role.id, permission_name, db):
-                        return True
+                has_permission = bool(await db.scalar(query))
                 
-                return False
+                self._cache_permission(user_id, permission_name, has_permission)
+                return has_permission
                 
             except Exception as e:
                 logger.error(f"Error checking permission {permission_name} for user {user_id}: {e}")
@@ -66,66 +129,19 @@ class PermissionService:
         db: Optional[AsyncSession] = None
     ) -> List[SystemRole]:
         """Get all roles assigned to a user"""
-        if db is None:
-            async with get_db_session() as db:
-                return await self._get_user_roles_impl(user_id, db)
-        else:
-            return await self._get_user_roles_impl(user_id, db)
-    
-    async def _get_user_roles_impl(
-        self, 
-        user_id: UUID, 
-        db: AsyncSession
-    ) -> List[SystemRole]:
-        """Implementation of get_user_roles"""
         try:
-            query = (
-                select(SystemRole)
-                .join(UserRole, SystemRole.id == UserRole.role_id)
-                .where(UserRole.user_id == user_id)
-                .where(SystemRole.is_active == True)
-            )
+            if db is None:
+                async with get_db_session() as session:
+                    result = await session.execute(_USER_ROLES_STMT, {"user_id": user_id})
+                    return list(result.scalars())
             
-            result = await db.execute(query)
-            roles = result.scalars().all()
-            
-            return list(roles)
+            result = await db.execute(_USER_ROLES_STMT, {"user_id": user_id})
+            return list(result.scalars())
             
         except Exception as e:
             logger.error(f"Error getting user roles for {user_id}: {e}")
             return []
     
-    async def _role_has_permission(
-        self, 
-        role_id: UUID, 
-        permission_name: str, 
-        db: AsyncSession
-    ) -> bool:
-        """Check if a role has a specific permission"""
-        try:
-            # Query to check if role has permission
-            query = (
-                select(RoleAPIPermission.granted)
-                .join(APIPermission, RoleAPIPermission.api_permission_id == APIPermission.id)
-                .where(
-                    and_(
-                        RoleAPIPermission.role_id == role_id,
-                        APIPermission.permission_name == permission_name,
-                        APIPermission.is_active == True
-                    )
-                )
-            )
-            
-            result = await db.execute(query)
-            granted = result.scalar()
-            
-            # If no explicit permission found, default to False
-            return granted if granted is not None else False
-            
-        except Exception as e:
-            logger.error(f"Error checking role permission {permission_name} for role {role_id}: {e}")
-            return False
-    
     async def assign_role_to_user(
         self, 
         user_id: UUID, 
@@ -135,46 +151,55 @@ class PermissionService:
         """Assign a role to a user"""
         async with get_db_session() as db:
             try:
-                # Get role by name
-                role_query = select(SystemRole).where(
-                    and_(
-                        SystemRole.name == role_name,
-                        SystemRole.is_active == True
+                # Resolve the role and insert the assignment in one statement
+                role_select = (
+                    select(
+                        literal(user_id, type_=PG_UUID(as_uuid=True)),
+                        SystemRole.id,
+                        # Typed so a None assigned_by still binds as a uuid
+                        literal(assigned_by, type_=PG_UUID(as_uuid=True))
                     )
+                    .where(
+                        and_(
+                            SystemRole.name == role_name,
+                            SystemRole.is_active == True
+                        )
+                    )
+                )
+                stmt = (
+                    insert(UserRole)
+                    .from_select(["user_id", "role_id", "assigned_by"], role_select)
+                    .on_conflict_do_nothing(index_elements=["user_id", "role_id"])
+                    .returning(UserRole.id)
                 )
-                role_result = await db.execute(role_query)
-                role = role_result.scalar_one_or_none()
                 
-                if not role:
-                    logger.error(f"Role {role_name} not found")
-                    return False
+                result = await db.execute(stmt)
+                inserted_id = result.scalar_one_or_none()
+                await db.commit()
                 
-                # Check if user already has this role
-                existing_query = select(UserRole).where(
-                    and_(
-                        UserRole.user_id == user_id,
-                        UserRole.role_id == role.id
+                if inserted_id is not None:
+                    self.invalidate_user_permissions(user_id)
+                    logger.info(f"Assigned role {role_name} to user {user_id}")
+                    return True
+                
+                # Nothing inserted: either the role does not exist or it is already assigned
+                existing_query = (
+                    select(UserRole.id)
+                    .join(SystemRole, UserRole.role_id == SystemRole.id)
+                    .where(
+                        and_(
+                            UserRole.user_id == user_id,
+                            SystemRole.name == role_name,
+                            SystemRole.is_active == True
+                        )
                     )
                 )
-                existing_result = await db.execute(existing_query)
-                existing = existing_result.scalar_one_or_none()
-                
-                if existing:
+                if await db.scalar(existing_query) is not None:
                     logger.info(f"User {user_id} already has role {role_name}")
                     return True
                 
-                # Create new user role
-                user_role = UserRole(
-                    user_id=user_id,
-                    role_id=role.id,
-                    assigned_by=assigned_by
-                )
-                
-                db.add(user_role)
-                await db.commit()
-                
-                logger.info(f"Assigned role {role_name} to user {user_id}")
-                return True
+                logger.error(f"Role {role_name} not found")
+                return False
                 
             except Exception as e:
                 await db.rollback()
@@ -189,24 +214,28 @@ class PermissionService:
         """Remove a role from a user"""
         async with get_db_session() as db:
             try:
-                # Find and delete the user role
-                query = (
-                    select(UserRole)
-                    .join(SystemRole, UserRole.role_id == SystemRole.id)
+                # Delete the user role directly, resolving the role by name in a subquery
+                stmt = (
+                    delete(UserRole)
                     .where(
                         and_(
                             UserRole.user_id == user_id,
-                            SystemRole.name == role_name
+                            UserRole.role_id == (
+                                select(SystemRole.id)
+                                .where(SystemRole.name == role_name)
+                                .scalar_subquery()
+                            )
                         )
                     )
+                    .returning(UserRole.id)
                 )
                 
-                result = await db.execute(query)
-                user_role = result.scalar_one_or_none()
+                result = await db.execute(stmt)
+                deleted_id = result.scalar_one_or_none()
+                await db.commit()
                 
-                if user_role:
-                    await db.delete(user_role)
-                    await db.commit()
+                if deleted_id is not None:
+                    self.invalidate_user_permissions(user_id)
                     logger.info(f"Removed role {role_name} from user {user_id}")
                     return True
                 else:
@@ -298,21 +327,37 @@ class PermissionService:
         """Sync API permissions from the permissions registry"""
         from app.core.permissions import API_PERMISSIONS_REGISTRY
         
+        if not API_PERMISSIONS_REGISTRY:
+            return True
+        
         async with get_db_session() as db:
             try:
-                for perm in API_PERMISSIONS_REGISTRY:
-                    await self.create_api_permission(
-                        route_path=perm.route_path,
-                        method=perm.method.value,
-                        permission_name=perm.permission_name,
-                        description=perm.description,
-                        category=perm.category
-                    )
+                values = [
+                    {
+                        "route_path": perm.route_path,
+                        "method": perm.method.value,
+                        "permission_name": perm.permission_name,
+                        "description": perm.description,
+                        "category": perm.category
+                    }
+                    for perm in API_PERMISSIONS_REGISTRY
+                ]
+                
+                # Single bulk insert; existing route/method pairs are left untouched
+                stmt = (
+                    insert(APIPermission)
+                    .values(values)
+                    .on_conflict_do_nothing(index_elements=["route_path", "method"])
+                )
+                
+                await db.execute(stmt)
+                await db.commit()
                 
                 logger.info("Successfully synced permissions from registry")
                 return True
                 
             except Exception as e:
+                await db.rollback()
                 logger.error(f"Error syncing permissions from registry: {e}")
                 return False
     
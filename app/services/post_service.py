@@ -1,31 +1,105 @@
 """
 Post service layer - Production implementation using raw SQL
 """
+import asyncio
+import base64
 import logging
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from decimal import Decimal
+from functools import wraps
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from uuid import UUID
+import orjson
 from fastapi import HTTPException
-from app.services.db_service import DatabaseService
+from app.db.redis_client import redis_manager
+from app.services.db_service import db_service
+from app.services.representative_service import representative_service
 
 logger = logging.getLogger(__name__)
 
+# The viewer-independent part of a single post (the row, author and assignee details) is
+# cached in Redis (when configured) until the post changes. The viewer's vote, saved and
+# follow state is looked up per request.
+POST_CACHE_TTL_SECONDS = 30
+POST_CACHE_KEY_PREFIX = "post:"
+VIEWER_POST_FIELDS = ("user_vote_type", "is_saved")
+
+def _json_default(value: Any) -> Any:
+    """Encode values orjson does not handle natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+def _restore_types(value: Any) -> Any:
+    """Turn id and timestamp strings of a decoded cached post back into UUIDs and datetimes"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, str) and (key == 'id' or key == 'assignee' or key.endswith('_id')):
+                try:
+                    value[key] = UUID(item)
+                except ValueError:
+                    pass
+            elif isinstance(item, str) and key.endswith('_at'):
+                value[key] = datetime.fromisoformat(item)
+            else:
+                _restore_types(item)
+    elif isinstance(value, list):
+        for item in value:
+            _restore_types(item)
+    return value
+
+async def invalidate_post_cache(post_id: UUID):
+    """Drop the cached data for a post"""
+    redis = redis_manager.get_client()
+    if redis is None:
+        return
+    
+    try:
+        await redis.delete(f"{POST_CACHE_KEY_PREFIX}{post_id}")
+    except Exception as e:
+        logger.warning(f"Failed to invalidate post cache for {post_id}: {e}")
+
+def encode_post_cursor(post: Dict[str, Any]) -> str:
+    """Build an opaque keyset pagination cursor pointing just past `post`"""
+    raw = f"{post['created_at'].isoformat()}|{post['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_post_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor from encode_post_cursor into (created_at, id)"""
+    try:
+        created_at, post_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), UUID(post_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def service_errors(detail: str) -> Callable:
+    """Re-raise HTTPExceptions as-is and turn any other failure into a logged 500 with `detail`"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception:
+                logger.exception(f"{detail} ({func.__name__})")
+                raise HTTPException(status_code=500, detail=detail)
+        return wrapper
+    return decorator
+
 class PostService:
     """Service for post-related operations using raw SQL"""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
     
     async def create_post(self, post_data: Dict[str, Any], author_id: UUID) -> Dict[str, Any]:
         """Create a new post"""
-        # Create the post in database
-
+        # Create the post in database; it comes back with author info, ready to format
         post = await self.db_service.create_post(post_data, author_id)
         
-        # Get full post with author info
-        full_post = await self.db_service.get_post_by_id(post['id'])
-        
         # Format response with engagement data
-        response = await self._format_post_response(full_post, author_id)
+        response = await self._format_post_response(post, author_id)
         
         logger.info(f"Created post {post['id']} by user {author_id}")
         return response
@@ -40,9 +114,15 @@ class PostService:
         author_id: Optional[UUID] = None,
         assignee: Optional[List[str]] = None,
         current_user_id: Optional[UUID] = None,
-        include_follow_status: bool = True
+        include_follow_status: bool = True,
+        cursor: Optional[str] = None,
+        summary: bool = False
     ) -> List[Dict[str, Any]]:
-        """Get posts with filters and pagination"""
+        """
+        Get posts with filters and pagination
+        Pass `cursor` (see encode_post_cursor) for keyset pagination instead of `skip`
+        With `summary`, posts are returned without content, media_urls and assignee_info
+        """
         # Get posts from database
         posts = await self.db_service.get_posts(
             skip=skip,
@@ -50,87 +130,77 @@ class PostService:
             post_type=post_type,
             user_id=author_id,
             location=location,
-            assignee=assignee
+            assignee=assignee,
+            viewer_id=current_user_id,
+            before=decode_post_cursor(cursor) if cursor else None,
+            summary=summary
         )
 
-        # Convert to response format
-        responses = []
-        for post in posts:
-            response = await self._format_post_response(post, current_user_id, include_follow_status)
-            responses.append(response)
+        # Load engagement data for the whole page, then convert to response format
+        engagement = await self._load_engagement(
+            posts, current_user_id, include_follow_status, include_assignee_info=not summary
+        )
+        build = self._build_summary_response if summary else self._build_response
+        responses = [
+            build(post, engagement[post['id']], include_follow_status)
+            for post in posts
+        ]
         
         logger.info(f"Retrieved {len(responses)} posts with filters: type={post_type}, location={location}, assignee={assignee}")
         return responses
             
     
+    @service_errors("Failed to retrieve post")
     async def get_post_by_id(self, post_id: UUID, current_user_id: Optional[UUID] = None, include_follow_status: bool = True) -> Dict[str, Any]:
         """Get a specific post by ID"""
-        try:
-            post = await self.db_service.get_post_by_id(post_id)
+        cache_key = f"{POST_CACHE_KEY_PREFIX}{post_id}"
+        cached = await self._get_cached_post(cache_key)
+        if cached is not None:
+            post, assignee_info = cached
+            engagement = await self._fetch_post_engagement(
+                post, post['id'], post['author']['id'], current_user_id, include_follow_status
+            )
+        else:
+            post = await self.db_service.get_post_by_id(post_id, viewer_id=current_user_id)
             if not post:
                 raise HTTPException(status_code=404, detail="Post not found")
             
-            response = await self._format_post_response(post, current_user_id, include_follow_status)
-            
-            logger.info(f"Retrieved post {post_id}")
-            return response
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error retrieving post {post_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to retrieve post")
+            engagement, assignee_info = await asyncio.gather(
+                self._fetch_post_engagement(post, post['id'], post['author']['id'], current_user_id, include_follow_status),
+                self._get_assignee_info(post)
+            )
+            await self._cache_post(post_id, cache_key, post, assignee_info)
+        
+        engagement["assignee_info"] = assignee_info
+        response = self._build_response(post, engagement, include_follow_status)
+        
+        logger.info(f"Retrieved post {post_id}")
+        return response
     
+    @service_errors("Failed to update post")
     async def update_post(self, post_id: UUID, post_data: Dict[str, Any], current_user_id: Optional[UUID] = None) -> Dict[str, Any]:
         """Update a post"""
-        try:
-            # Get the post first to check ownership if current_user_id is provided
-            if current_user_id is not None:
-                post = await self.db_service.get_post_by_id(post_id)
-                if not post:
-                    raise HTTPException(status_code=404, detail="Post not found")
-                
-                post_author_id = post['author']['id']
-                if isinstance(post_author_id, str):
-                    post_author_id = UUID(post_author_id)
-                if post_author_id != current_user_id:
-                    raise HTTPException(status_code=403, detail="Not authorized to update this post")
-            
-            # Update the post
-            updated_post = await self.db_service.update_post(post_id, post_data)
-            if not updated_post:
-                raise HTTPException(status_code=404, detail="Post not found")
-            
-            response = await self._format_post_response(updated_post, current_user_id)
-            
-            logger.info(f"Updated post {post_id} by user {current_user_id or 'system'}")
-            return response
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error updating post {post_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to update post")
+        # Update the post, restricted to the author's own post when current_user_id is provided
+        updated_post = await self.db_service.update_post(post_id, post_data, author_id=current_user_id)
+        if not updated_post:
+            await self._raise_not_found_or_forbidden(post_id, "Not authorized to update this post")
+        await invalidate_post_cache(post_id)
+        
+        response = await self._format_post_response(updated_post, current_user_id)
+        
+        logger.info(f"Updated post {post_id} by user {current_user_id or 'system'}")
+        return response
 
     async def update_post_status(self, post_id: UUID, status: str, current_user_id: UUID) -> Dict[str, Any]:
         """Update post status with authorization checks"""
-        # Get the post first to check authorization
-        post = await self.db_service.get_post_by_id(post_id)
-        if not post:
-            raise HTTPException(status_code=404, detail="Post not found")
-        
-        # Check if user is authorized to update status
-        is_authorized = await self._check_post_status_authorization(post, current_user_id)
-        if not is_authorized:
-            raise HTTPException(
-                status_code=403, 
-                detail="Not authorized to update post status. Only post author or assigned representatives can update status."
-            )
-        
-        # Update the post status
-        updated_post = await self.db_service.update_post_status(post_id, status)
+        # Authorization (post author or assigned representative) is checked by the UPDATE itself
+        updated_post = await self.db_service.update_post_status(post_id, status, manager_id=current_user_id)
         if not updated_post:
-            raise HTTPException(status_code=404, detail="Post not found")
+            await self._raise_not_found_or_forbidden(
+                post_id,
+                "Not authorized to update post status. Only post author or assigned representatives can update status."
+            )
+        await invalidate_post_cache(post_id)
         
         response = await self._format_post_response(updated_post, current_user_id)
         
@@ -139,31 +209,18 @@ class PostService:
 
     async def update_post_assignee(self, post_id: UUID, assignee_id: Optional[str], current_user_id: UUID) -> Dict[str, Any]:
         """Update post assignee with authorization checks"""
-        # Get the post first to check authorization
-        post = await self.db_service.get_post_by_id(post_id)
-        if not post:
-            raise HTTPException(status_code=404, detail="Post not found")
-        
-        # Check if user is authorized to update assignee
-        is_authorized = await self._check_post_assignee_authorization(post, current_user_id)
-        if not is_authorized:
-            raise HTTPException(
-                status_code=403, 
-                detail="Not authorized to update post assignee. Only post author or current assignee can update assignee."
-            )
-        
-        # If assigning to someone, validate the representative exists
-        if assignee_id:
-            from app.services.representative_service import RepresentativeService
-            rep_service = RepresentativeService()
-            representative = await rep_service.get_representative_by_id(assignee_id)
-            if not representative:
-                raise HTTPException(status_code=400, detail="Invalid representative ID")
-        
-        # Update the post assignee
-        updated_post = await self.db_service.update_post_assignee(post_id, assignee_id)
+        # Authorization (post author or current assignee) and the new representative are checked by the UPDATE itself
+        updated_post = await self.db_service.update_post_assignee(post_id, assignee_id, manager_id=current_user_id)
         if not updated_post:
-            raise HTTPException(status_code=404, detail="Post not found")
+            # Report a missing or off-limits post first, so only users who may manage the post
+            # learn whether a representative ID exists
+            if not assignee_id or not await self.db_service.can_manage_post(post_id, current_user_id):
+                await self._raise_not_found_or_forbidden(
+                    post_id,
+                    "Not authorized to update post assignee. Only post author or current assignee can update assignee."
+                )
+            raise HTTPException(status_code=400, detail="Invalid representative ID")
+        await invalidate_post_cache(post_id)
         
         response = await self._format_post_response(updated_post, current_user_id)
         
@@ -171,269 +228,324 @@ class PostService:
         logger.info(f"Updated post {post_id} assignee ({action}) by user {current_user_id}")
         return response
 
-    async def _check_post_assignee_authorization(self, post: Dict[str, Any], user_id: UUID) -> bool:
-        """Check if user is authorized to update post assignee"""
-        # Check if user is the post author
-        post_author_id = post['author']['id']
-        if isinstance(post_author_id, str):
-            post_author_id = UUID(post_author_id)
-        if post_author_id == user_id:
-            return True
-        
-        # Check if user is the current assignee
-        assignee_id = post.get('assignee')
-        if assignee_id:
-            # Get user's linked representative accounts
-            from app.services.representative_service import RepresentativeService
-            rep_service = RepresentativeService()
-            user_rep_accounts = await rep_service.get_user_rep_accounts(user_id)
-            
-            # Check if any of user's representative accounts match the current assignee
-            for rep_account in user_rep_accounts:
-                if str(rep_account['id']) == str(assignee_id):
-                    return True
-        
-        return False
-
-    async def _check_post_status_authorization(self, post: Dict[str, Any], user_id: UUID) -> bool:
-        """Check if user is authorized to update post status"""
-        # Check if user is the post author
-        post_author_id = post['author']['id']
-        if isinstance(post_author_id, str):
-            post_author_id = UUID(post_author_id)
-        if post_author_id == user_id:
-            return True
-        
-        # Check if post has an assignee and user is linked to that representative
-        assignee_id = post.get('assignee')
-        if assignee_id:
-            # Get user's linked representative accounts
-            from app.services.representative_service import RepresentativeService
-            rep_service = RepresentativeService()
-            user_rep_accounts = await rep_service.get_user_rep_accounts(user_id)
-            
-            # Check if any of user's representative accounts match the assignee
-            for rep_account in user_rep_accounts:
-                if str(rep_account['id']) == str(assignee_id):
-                    return True
-        
-        return False
+    async def _raise_not_found_or_forbidden(self, post_id: UUID, forbidden_detail: str):
+        """After an authorized write matched no row, report whether the post is missing or off-limits"""
+        if not await self.db_service.post_exists(post_id):
+            raise HTTPException(status_code=404, detail="Post not found")
+        raise HTTPException(status_code=403, detail=forbidden_detail)
     
+    @service_errors("Failed to delete post")
     async def delete_post(self, post_id: UUID, current_user_id: UUID) -> bool:
         """Delete a post"""
-        try:
-            # Get the post first to check ownership
-            post = await self.db_service.get_post_by_id(post_id)
-            if not post:
-                raise HTTPException(status_code=404, detail="Post not found")
-            
-            post_author_id = post['author']['id']
-            if isinstance(post_author_id, str):
-                post_author_id = UUID(post_author_id)
-            if post_author_id != current_user_id:
-                raise HTTPException(status_code=403, detail="Not authorized to delete this post")
-            
-            # Delete the post
-            success = await self.db_service.delete_post(post_id)
-            if not success:
-                raise HTTPException(status_code=404, detail="Post not found")
-            
-            logger.info(f"Deleted post {post_id} by user {current_user_id}")
-            return True
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error deleting post {post_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to delete post")
+        # Delete the post, restricted to the author's own post
+        success = await self.db_service.delete_post(post_id, author_id=current_user_id)
+        if not success:
+            await self._raise_not_found_or_forbidden(post_id, "Not authorized to delete this post")
+        await invalidate_post_cache(post_id)
+        
+        logger.info(f"Deleted post {post_id} by user {current_user_id}")
+        return True
     
+    @service_errors("Failed to vote on post")
     async def vote_on_post(self, post_id: UUID, vote_type: str, user_id: UUID) -> Dict[str, Any]:
         """Vote on a post (upvote/downvote)"""
-        try:
-            # Validate vote type
-            if vote_type.lower() not in ['upvote', 'downvote']:
-                raise HTTPException(status_code=400, detail="Invalid vote type")
-            
-            # Create or update vote
-            vote = await self.db_service.create_or_update_vote(post_id, user_id, vote_type.lower())
-            
-            # Get updated vote counts
-            vote_counts = await self.db_service.get_post_vote_counts(post_id)
-            
-            # Get user's current vote status
-            user_vote = await self.db_service.get_user_vote_on_post(post_id, user_id)
-            is_upvoted = user_vote and user_vote['vote_type'] == 'upvote'
-            is_downvoted = user_vote and user_vote['vote_type'] == 'downvote'
-            
-            result = {
-                "upvotes": vote_counts["upvotes"],
-                "downvotes": vote_counts["downvotes"],
-                "is_upvoted": is_upvoted,
-                "is_downvoted": is_downvoted
-            }
-            
-            logger.info(f"User {user_id} voted {vote_type} on post {post_id}")
-            return result
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error voting on post {post_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to vote on post")
+        # Validate vote type
+        if vote_type.lower() not in ['upvote', 'downvote']:
+            raise HTTPException(status_code=400, detail="Invalid vote type")
+        
+        # The write returns the user's current vote (None when it toggled the vote off)
+        # together with the post's updated counts
+        user_vote, vote_counts = await self.db_service.create_or_update_vote(post_id, user_id, vote_type.lower())
+        await invalidate_post_cache(post_id)
+        
+        is_upvoted = user_vote and user_vote['vote_type'] == 'upvote'
+        is_downvoted = user_vote and user_vote['vote_type'] == 'downvote'
+        
+        result = {
+            "upvotes": vote_counts["upvotes"],
+            "downvotes": vote_counts["downvotes"],
+            "is_upvoted": is_upvoted,
+            "is_downvoted": is_downvoted
+        }
+        
+        logger.info(f"User {user_id} voted {vote_type} on post {post_id}")
+        return result
     
+    @service_errors("Failed to save post")
     async def save_post(self, post_id: UUID, user_id: UUID) -> Dict[str, bool]:
         """Save a post for a user"""
-        try:
-            await self.db_service.save_post(post_id, user_id)
-            
-            logger.info(f"User {user_id} saved post {post_id}")
-            return {"is_saved": True}
-            
-        except Exception as e:
-            logger.error(f"Error saving post {post_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to save post")
+        await self.db_service.save_post(post_id, user_id)
+        await invalidate_post_cache(post_id)
+        
+        logger.info(f"User {user_id} saved post {post_id}")
+        return {"is_saved": True}
     
+    @service_errors("Failed to unsave post")
     async def unsave_post(self, post_id: UUID, user_id: UUID) -> Dict[str, bool]:
         """Remove a saved post for a user"""
-        try:
-            success = await self.db_service.unsave_post(post_id, user_id)
-            
-            if success:
-                logger.info(f"User {user_id} unsaved post {post_id}")
-            
-            return {"is_saved": False}
-            
-        except Exception as e:
-            logger.error(f"Error unsaving post {post_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to unsave post")
+        success = await self.db_service.unsave_post(post_id, user_id)
+        await invalidate_post_cache(post_id)
+        
+        if success:
+            logger.info(f"User {user_id} unsaved post {post_id}")
+        
+        return {"is_saved": False}
     
+    @service_errors("Failed to retrieve saved posts")
     async def get_saved_posts(self, user_id: UUID, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
         """Get saved posts for a user"""
+        # TODO: Implement get_saved_posts in DatabaseService
+        # For now, return empty list
+        logger.info(f"Retrieved 0 saved posts for user {user_id} (not implemented)")
+        return []
+    
+    @service_errors("Failed to retrieve trending posts")
+    async def get_trending_posts(
+        self,
+        hours: int = 24,
+        limit: int = 10,
+        current_user_id: Optional[UUID] = None,
+        summary: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Get trending posts, as summaries (see get_posts) when `summary` is set"""
+        posts = await self.db_service.get_trending_posts(hours, limit)
+        
+        engagement = await self._load_engagement(
+            posts, current_user_id, include_assignee_info=not summary
+        )
+        build = self._build_summary_response if summary else self._build_response
+        responses = [
+            build(post, engagement[post['id']])
+            for post in posts
+        ]
+        
+        logger.info(f"Retrieved {len(responses)} trending posts")
+        return responses
+    
+    @service_errors("Failed to retrieve user posts")
+    async def get_posts_by_user(self, user_id: UUID, skip: int = 0, limit: int = 100, current_user_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
+        """Get all posts by a specific user"""
+        posts = await self.get_posts(
+            skip=skip,
+            limit=limit,
+            author_id=user_id,
+            current_user_id=current_user_id,
+            include_follow_status=False  # No need for follow status when getting user's own posts
+        )
+        
+        logger.info(f"Retrieved {len(posts)} posts for user {user_id}")
+        return posts
+    
+    async def _get_cached_post(self, cache_key: str) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """Get a cached (post, assignee_info) pair, or None on a miss or when Redis is not enabled"""
+        redis = redis_manager.get_client()
+        if redis is None:
+            return None
+        
         try:
-            # TODO: Implement get_saved_posts in DatabaseService
-            # For now, return empty list
-            logger.info(f"Retrieved 0 saved posts for user {user_id} (not implemented)")
-            return []
-            
+            cached = await redis.get(cache_key)
         except Exception as e:
-            logger.error(f"Error retrieving saved posts for user {user_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to retrieve saved posts")
+            logger.warning(f"Failed to read post cache {cache_key}: {e}")
+            return None
+        
+        if not cached:
+            return None
+        
+        entry = _restore_types(orjson.loads(cached))
+        return entry["post"], entry["assignee_info"]
     
-    async def get_trending_posts(self, hours: int = 24, limit: int = 10, current_user_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
-        """Get trending posts"""
+    async def _cache_post(
+        self,
+        post_id: UUID,
+        cache_key: str,
+        post: Dict[str, Any],
+        assignee_info: Optional[Dict[str, Any]]
+    ):
+        """Cache the viewer-independent data of a post"""
+        redis = redis_manager.get_client()
+        if redis is None:
+            return
+        
+        entry = {
+            "post": {key: value for key, value in post.items() if key not in VIEWER_POST_FIELDS},
+            "assignee_info": assignee_info
+        }
         try:
-            posts = await self.db_service.get_trending_posts(hours, limit)
-            
-            responses = []
-            for post in posts:
-                response = await self._format_post_response(post, current_user_id)
-                responses.append(response)
-            
-            logger.info(f"Retrieved {len(responses)} trending posts")
-            return responses
-            
+            await redis.setex(cache_key, POST_CACHE_TTL_SECONDS, orjson.dumps(entry, default=_json_default))
         except Exception as e:
-            logger.error(f"Error retrieving trending posts: {e}")
-            raise HTTPException(status_code=500, detail="Failed to retrieve trending posts")
+            logger.warning(f"Failed to cache post {post_id}: {e}")
     
-    async def get_posts_by_user(self, user_id: UUID, skip: int = 0, limit: int = 100, current_user_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
-        """Get all posts by a specific user"""
-        try:
-            posts = await self.get_posts(
-                skip=skip,
-                limit=limit,
-                author_id=user_id,
-                current_user_id=current_user_id,
-                include_follow_status=False  # No need for follow status when getting user's own posts
-            )
-            
-            logger.info(f"Retrieved {len(posts)} posts for user {user_id}")
-            return posts
+    async def _load_engagement(
+        self,
+        posts: List[Dict[str, Any]],
+        current_user_id: Optional[UUID] = None,
+        include_follow_status: bool = True,
+        include_assignee_info: bool = True
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """Fetch engagement data for a page of posts with one query per viewer-specific lookup"""
+        post_ids = [post['id'] for post in posts]
+        if not post_ids:
+            return {}
+        
+        # Counters come from the posts row; get_posts also joins the viewer's vote and saved state
+        viewer_state_loaded = all('user_vote_type' in post for post in posts)
+        
+        queries = {}
+        if current_user_id and not viewer_state_loaded:
+            queries["user_votes"] = self.db_service.get_user_votes_bulk(post_ids, current_user_id)
+            queries["saved"] = self.db_service.is_post_saved_bulk(post_ids, current_user_id)
+        
+        if current_user_id and include_follow_status:
+            author_ids = list({
+                post['author']['id'] for post in posts
+                if post['author']['id'] != current_user_id
+            })
+            if author_ids:
+                queries["follow_status"] = self.db_service.check_follow_status_bulk(current_user_id, author_ids)
+        
+        # One representative lookup per distinct assignee on the page
+        assignee_posts = {
+            post['assignee']: post for post in posts
+            if include_assignee_info and post.get('assignee')
+        }
+        for assignee, post in assignee_posts.items():
+            queries[("assignee_info", assignee)] = self._get_assignee_info(post)
+        
+        results = dict(zip(queries.keys(), await asyncio.gather(*queries.values())))
+        user_votes = results.get("user_votes", {})
+        saved = results.get("saved", set())
+        follow_status = results.get("follow_status", {})
+        
+        engagement = {}
+        for post in posts:
+            post_id = post['id']
+            engagement[post_id] = {
+                "upvotes": post['upvotes'],
+                "downvotes": post['downvotes'],
+                "comment_count": post['comment_count'],
+                "user_vote_type": post['user_vote_type'] if viewer_state_loaded else user_votes.get(post_id),
+                "is_saved": post['is_saved'] if viewer_state_loaded else post_id in saved,
+                "follow_status": follow_status.get(post['author']['id']),
+                "assignee_info": results.get(("assignee_info", post.get('assignee')))
+            }
+        
+        return engagement
+    
+    async def _fetch_post_engagement(
+        self,
+        post: Dict[str, Any],
+        post_id: UUID,
+        author_id: UUID,
+        current_user_id: Optional[UUID] = None,
+        include_follow_status: bool = True
+    ) -> Dict[str, Any]:
+        """Fetch the viewer's engagement state for a single post, running the queries concurrently"""
+        # get_post_by_id(viewer_id=...) already joins the viewer's vote and saved state
+        viewer_state_loaded = 'user_vote_type' in post
+        
+        queries = {}
+        if current_user_id:
+            if not viewer_state_loaded:
+                queries["user_vote"] = self.db_service.get_user_vote_on_post(post_id, current_user_id)
+                queries["is_saved"] = self.db_service.is_post_saved(post_id, current_user_id)
             
+            # Only check follow status if the post author is different from current user
+            if include_follow_status and author_id != current_user_id:
+                queries["follow_status"] = self.db_service.check_follow_status(current_user_id, author_id)
+        
+        results = dict(zip(queries.keys(), await asyncio.gather(*queries.values())))
+        if viewer_state_loaded:
+            user_vote_type = post['user_vote_type']
+            is_saved = post['is_saved']
+        else:
+            user_vote = results.get("user_vote")
+            user_vote_type = user_vote['vote_type'] if user_vote else None
+            is_saved = results.get("is_saved", False)
+        
+        return {
+            "upvotes": post['upvotes'],
+            "downvotes": post['downvotes'],
+            "comment_count": post['comment_count'],
+            "user_vote_type": user_vote_type,
+            "is_saved": is_saved,
+            "follow_status": results.get("follow_status")
+        }
+    
+    async def _get_assignee_info(self, post: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get assignee details if post has an assignee"""
+        if not post.get('assignee'):
+            return None
+        
+        try:
+            return await representative_service.get_representative_with_user_details(post['assignee'])
         except Exception as e:
-            logger.error(f"Error retrieving posts for user {user_id}: {e}")
-            raise HTTPException(status_code=500, detail="Failed to retrieve user posts")
+            logger.error(f"Error fetching assignee details for post {post['id']}: {e}")
+            # Don't fail the whole request if assignee details can't be fetched
+            return None
     
-    async def _format_post_response(self, post: Dict[str, Any], current_user_id: Optional[UUID] = None, include_follow_status: bool = True) -> Dict[str, Any]:
-        """Convert database post to API response format"""
-        # Handle UUID - post['id'] is already a UUID object from asyncpg
-        post_id = post['id'] if isinstance(post['id'], UUID) else UUID(post['id'])
-        
-        # Get vote counts
-        vote_counts = await self.db_service.get_post_vote_counts(post_id)
-        
-        # Get user's vote status if logged in
-        is_upvoted = False
-        is_downvoted = False
-        is_saved = False
+    async def _format_post_response(
+        self,
+        post: Dict[str, Any],
+        current_user_id: Optional[UUID] = None,
+        include_follow_status: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Convert a single database post to API response format, fetching its engagement data
+        Listings preload engagement with _load_engagement and call _build_response directly
+        """
+        # DatabaseService returns ids as UUID objects straight from asyncpg
+        post_id = post['id']
+        post_author_id = post['author']['id']
+        
+        engagement, assignee_info = await asyncio.gather(
+            self._fetch_post_engagement(post, post_id, post_author_id, current_user_id, include_follow_status),
+            self._get_assignee_info(post)
+        )
+        engagement["assignee_info"] = assignee_info
+        
+        return self._build_response(post, engagement, include_follow_status)
+    
+    def _build_summary_response(
+        self,
+        post: Dict[str, Any],
+        engagement: Dict[str, Any],
+        include_follow_status: bool = True
+    ) -> Dict[str, Any]:
+        """Build the listing summary for a post: the full response minus content, media_urls and assignee_info"""
+        user_vote_type = engagement["user_vote_type"]
+        is_upvoted = user_vote_type == 'upvote'
+        is_downvoted = user_vote_type == 'downvote'
+        
         is_following = None
         is_followed_by = None
         follow_mutual = None
+        follow_status = engagement["follow_status"]
+        if follow_status:
+            is_following = follow_status.get('is_following', False)
+            is_followed_by = follow_status.get('is_followed_by', False)
+            follow_mutual = follow_status.get('mutual', False)
         
-        if current_user_id:
-            user_vote = await self.db_service.get_user_vote_on_post(post_id, current_user_id)
-            if user_vote:
-                is_upvoted = user_vote['vote_type'] == 'upvote'
-                is_downvoted = user_vote['vote_type'] == 'downvote'
-            
-            is_saved = await self.db_service.is_post_saved(post_id, current_user_id)
-            
-            # Get follow status between current user and post author only if requested
-            if include_follow_status:
-                post_author_id = post['author']['id']
-                if isinstance(post_author_id, str):
-                    post_author_id = UUID(post_author_id)
-                
-                # Only check follow status if the post author is different from current user
-                if post_author_id != current_user_id:
-                    follow_status = await self.db_service.check_follow_status(current_user_id, post_author_id)
-                    if follow_status:
-                        is_following = follow_status.get('is_following', False)
-                        is_followed_by = follow_status.get('is_followed_by', False)
-                        follow_mutual = follow_status.get('mutual', False)
-        
-        # Get comments count
-        comments = await self.db_service.get_comments_by_post(post_id)
-        comment_count = len(comments)
-        
-        # Get assignee details if post has an assignee
-        assignee_info = None
-        if post.get('assignee'):
-            try:
-                from app.services.representative_service import RepresentativeService
-                rep_service = RepresentativeService()
-                # Handle the case where assignee might already be a UUID object
-                assignee_id = post['assignee']
-                if not isinstance(assignee_id, UUID):
-                    assignee_id = UUID(assignee_id)
-                assignee_details = await rep_service.get_representative_with_user_details(assignee_id)
-                if assignee_details:
-                    assignee_info = assignee_details
-            except Exception as e:
-                logger.error(f"Error fetching assignee details for post {post_id}: {e}")
-                # Don't fail the whole request if assignee details can't be fetched
-                assignee_info = None
+        latitude = post.get('latitude')
+        longitude = post.get('longitude')
         
         response = {
             "id": post['id'],
             "title": post['title'],
-            "content": post['content'],
             "post_type": post['post_type'],
             "status": post.get('status'),  # Include status field
             "assignee": post.get('assignee'),  # Include assignee field
-            "assignee_info": assignee_info,  # Include assignee details
-            "media_urls": post.get('media_urls', []),  # Map media_urls to images for API response
-            "latitude": post.get('latitude'),
-            "longitude": post.get('longitude'),
+            # NUMERIC columns come back as Decimal, which orjson does not encode natively
+            "latitude": float(latitude) if latitude is not None else None,
+            "longitude": float(longitude) if longitude is not None else None,
             "author": post['author'],
             "created_at": post['created_at'],
             "updated_at": post['updated_at'],
-            "upvotes": vote_counts["upvotes"],
-            "downvotes": vote_counts["downvotes"],
-            "comment_count": comment_count,
+            "upvotes": engagement["upvotes"],
+            "downvotes": engagement["downvotes"],
+            "comment_count": engagement["comment_count"],
             "is_upvoted": is_upvoted,
             "is_downvoted": is_downvoted,
-            "is_saved": is_saved
+            "is_saved": engagement["is_saved"]
         }
         
         # Only include follow status fields if requested
@@ -445,4 +557,21 @@ class PostService:
             })
         
         return response
-        
+    
+    def _build_response(
+        self,
+        post: Dict[str, Any],
+        engagement: Dict[str, Any],
+        include_follow_status: bool = True
+    ) -> Dict[str, Any]:
+        """Build the full API response for a post from its preloaded engagement data"""
+        response = self._build_summary_response(post, engagement, include_follow_status)
+        response.update({
+            "content": post['content'],
+            "assignee_info": engagement["assignee_info"],  # Include assignee details
+            "media_urls": post['media_urls']  # Post queries coalesce NULL media_urls to an empty array
+        })
+        return response
+
+# Global post service instance
+post_service = PostService()
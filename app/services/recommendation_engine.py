@@ -3,6 +3,7 @@ Recommendation Engine - Phase 3
 Candidate generation and heuristic ranking system
 """
 
+import asyncio
 import asyncpg
 import random
 import time
@@ -11,14 +12,36 @@ from datetime import datetime, timedelta
 import logging
 import math
 from dataclasses import dataclass
+from operator import attrgetter, itemgetter
 from uuid import UUID
 
 from app.core.config import settings
+from app.db.database import db_manager
 
 logger = logging.getLogger(__name__)
 
+# Affinities are recomputed by batch jobs every few minutes, so each worker reuses a
+# user's preferences for recs_cache_ttl_seconds
+PREFERENCES_CACHE_MAX_ENTRIES = 10_000
 
-@dataclass
+# user_id -> (preferences, expires_at)
+_preferences_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+_preferences_locks: Dict[str, asyncio.Lock] = {}
+
+
+# Dedicated generator for exploration sampling, kept apart from the process-wide random state
+_exploration_rng = random.Random()
+
+
+def invalidate_user_preferences(user_id: Optional[str] = None):
+    """Drop cached preferences for one user, or for everyone after a batch affinity update"""
+    if user_id is None:
+        _preferences_cache.clear()
+    else:
+        _preferences_cache.pop(str(user_id), None)
+
+
+@dataclass(slots=True)
 class CandidatePost:
     """Represents a candidate post with ranking features"""
     id: UUID
@@ -49,11 +72,90 @@ class CandidatePost:
             self.ranking_reasons = []
 
 
+# Row columns copied straight onto CandidatePost; sources without a column (trending has
+# no location data) leave the dataclass default
+_CANDIDATE_COLUMNS = (
+    'id', 'title', 'content', 'author_id', 'author_username', 'created_at',
+    'latitude', 'longitude', 'location', 'tags'
+)
+
+
+def _candidate_from_row(
+    row: asyncpg.Record, candidate_source: str, reason: str, **features: float
+) -> CandidatePost:
+    """Build a CandidatePost from a candidate source row"""
+    return CandidatePost(
+        **{column: row.get(column) for column in _CANDIDATE_COLUMNS},
+        quality_score=float(row['quality_score']),
+        engagement_rate=float(row['engagement_rate']),
+        recency_decay=float(row['recency_decay']),
+        candidate_source=candidate_source,
+        ranking_reasons=[reason],
+        **features
+    )
+
+
+# Users often refresh a feed within seconds, so each worker keeps a user's last feed:
+# it is served as-is for FEED_CACHE_FRESH_SECONDS, then served stale while one background
+# task rebuilds it, until FEED_CACHE_STALE_SECONDS. Only post ids and ranking features are
+# kept; post rows are re-read by id when a cached feed is served.
+FEED_CACHE_FRESH_SECONDS = 30
+FEED_CACHE_STALE_SECONDS = 120
+FEED_CACHE_MAX_ENTRIES = 1_000
+
+# Coordinates in the cache key are rounded to about a kilometre so nearby requests share a feed
+FEED_CACHE_COORDINATE_DIGITS = 2
+
+# Ranking state stored per cached post, restored onto the CandidatePost when served
+_RANKING_FIELDS = (
+    'quality_score', 'engagement_rate', 'recency_decay', 'personal_affinity',
+    'social_proximity', 'locality_match', 'candidate_source', 'ranking_reasons'
+)
+_ranking_state = attrgetter(*_RANKING_FIELDS)
+
+# (user_id, surface, limit, latitude, longitude) -> ([(post_id, ranking_state)], fresh_until, expires_at)
+FeedKey = Tuple[str, str, int, Optional[float], Optional[float]]
+CachedFeed = List[Tuple[UUID, Tuple[Any, ...]]]
+_feed_cache: Dict[FeedKey, Tuple[CachedFeed, float, float]] = {}
+_feed_locks: Dict[FeedKey, asyncio.Lock] = {}
+_feed_refresh_tasks: Dict[FeedKey, asyncio.Task] = {}
+
+
+def invalidate_user_feed(user_id: Optional[str] = None):
+    """Drop cached feeds for one user, or for everyone after a batch affinity update"""
+    if user_id is None:
+        _feed_cache.clear()
+        return
+    
+    user_id = str(user_id)
+    for key in [key for key in _feed_cache if key[0] == user_id]:
+        del _feed_cache[key]
+
+
+def _round_coordinate(value: Optional[float]) -> Optional[float]:
+    return round(value, FEED_CACHE_COORDINATE_DIGITS) if value is not None else None
+
+
+def _cache_feed(key: FeedKey, candidates: List[CandidatePost]):
+    """Cache the post ids and ranking features of a generated feed"""
+    if key not in _feed_cache and len(_feed_cache) >= FEED_CACHE_MAX_ENTRIES:
+        # Drop the oldest 25% of entries
+        items_to_remove = len(_feed_cache) // 4
+        for old_key in list(_feed_cache.keys())[:items_to_remove]:
+            del _feed_cache[old_key]
+    
+    now = time.monotonic()
+    feed = [(candidate.id, _ranking_state(candidate)) for candidate in candidates]
+    _feed_cache[key] = (feed, now + FEED_CACHE_FRESH_SECONDS, now + FEED_CACHE_STALE_SECONDS)
+
+
 class RecommendationEngine:
     """Main recommendation engine for generating personalized feeds"""
     
-    def __init__(self, db_connection: asyncpg.Connection):
-        self.db = db_connection
+    async def _fetch(self, query: str, *args) -> List[asyncpg.Record]:
+        """Run a query on its own pooled connection so independent queries can run concurrently"""
+        async with db_manager.get_connection() as conn:
+            return await conn.fetch(query, *args)
         
     async def generate_feed(
         self,
@@ -64,52 +166,144 @@ class RecommendationEngine:
         surface: str = "main_feed"
     ) -> List[CandidatePost]:
         """
-        Generate personalized feed using multiple candidate sources and heuristic ranking
+        Generate personalized feed using multiple candidate sources and heuristic ranking,
+        served from the per-user feed cache when possible
         """
-        start_time = time.time()
+        key = (
+            str(user_id), surface, limit,
+            _round_coordinate(user_latitude), _round_coordinate(user_longitude)
+        )
+        entry = _feed_cache.get(key)
+        if entry is not None:
+            feed, fresh_until, expires_at = entry
+            now = time.monotonic()
+            if now < fresh_until:
+                return await self._load_cached_feed(feed)
+            if now < expires_at:
+                # Stale while revalidate: answer now, rebuild once in the background
+                if key not in _feed_refresh_tasks:
+                    task = asyncio.create_task(self._refresh_feed(
+                        key, user_id, limit, user_latitude, user_longitude, surface
+                    ))
+                    _feed_refresh_tasks[key] = task
+                    task.add_done_callback(lambda _: _feed_refresh_tasks.pop(key, None))
+                return await self._load_cached_feed(feed)
+        
+        # Single flight: concurrent misses wait for the first one instead of rebuilding the feed
+        lock = _feed_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = _feed_cache.get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                waited_for = entry[0]
+            else:
+                waited_for = None
+                candidates = await self._build_feed(user_id, limit, user_latitude, user_longitude, surface)
+                _cache_feed(key, candidates)
+        
+        _feed_locks.pop(key, None)
+        if waited_for is not None:
+            return await self._load_cached_feed(waited_for)
+        return candidates
+    
+    async def _load_cached_feed(self, feed: CachedFeed) -> List[CandidatePost]:
+        """Rebuild the candidates of a cached feed from current post rows, in cached order"""
+        if not feed:
+            return []
         
-        # Get user preferences for personalization
-        user_preferences = await self._get_user_preferences(user_id)
+        rows = await self._fetch("""
+            SELECT 
+                p.id, p.title, p.content, p.user_id as author_id, p.created_at,
+                p.latitude, p.longitude, p.location, p.tags,
+                u.username as author_username
+            FROM posts p
+            JOIN users u ON p.user_id = u.id
+            WHERE p.id = ANY($1::uuid[])
+        """, [post_id for post_id, _ in feed])
+        rows_by_id = {row['id']: row for row in rows}
         
-        # Generate candidates from multiple sources
         candidates = []
+        for post_id, state in feed:
+            row = rows_by_id.get(post_id)
+            if row is None:
+                # Deleted since the feed was built
+                continue
+            ranking = dict(zip(_RANKING_FIELDS, state))
+            ranking['ranking_reasons'] = list(ranking['ranking_reasons'])
+            candidates.append(CandidatePost(
+                **{column: row[column] for column in _CANDIDATE_COLUMNS},
+                **ranking
+            ))
+        return candidates
+    
+    async def _refresh_feed(
+        self,
+        key: FeedKey,
+        user_id: str,
+        limit: int,
+        user_latitude: Optional[float],
+        user_longitude: Optional[float],
+        surface: str
+    ):
+        """Rebuild a stale cached feed in the background"""
+        try:
+            candidates = await self._build_feed(user_id, limit, user_latitude, user_longitude, surface)
+        except Exception as e:
+            logger.warning(f"Background feed refresh failed for user {user_id}: {e}")
+            return
+        _cache_feed(key, candidates)
+    
+    async def _build_feed(
+        self,
+        user_id: str,
+        limit: int,
+        user_latitude: Optional[float],
+        user_longitude: Optional[float],
+        surface: str
+    ) -> List[CandidatePost]:
+        """Run candidate generation, ranking and final selection for a feed"""
+        start_time = time.time()
         
+        # Candidate sources are independent of each other and of the user's preferences,
+        # so all of them are queried concurrently (asyncpg runs one query per connection)
+        sources = []
         if settings.recs_enable_social:
-            social_candidates = await self._generate_social_candidates(user_id, limit)
-            candidates.extend(social_candidates)
-            
+            sources.append(self._generate_social_candidates(user_id, limit))
         if settings.recs_enable_trending:
-            trending_candidates = await self._generate_trending_candidates(limit)
-            candidates.extend(trending_candidates)
-            
+            sources.append(self._generate_trending_candidates(limit))
         if settings.recs_enable_locality and user_latitude and user_longitude:
-            locality_candidates = await self._generate_locality_candidates(
-                user_latitude, user_longitude, limit
-            )
-            candidates.extend(locality_candidates)
-            
+            sources.append(self._generate_locality_candidates(user_latitude, user_longitude, limit))
         if settings.recs_enable_recency:
-            recency_candidates = await self._generate_recency_candidates(limit)
-            candidates.extend(recency_candidates)
+            sources.append(self._generate_recency_candidates(limit))
         
-        # Remove duplicates (keep first occurrence)
-        seen_ids = set()
-        unique_candidates = []
+        user_preferences, *source_results = await asyncio.gather(
+            self._get_user_preferences(user_id),
+            *sources,
+            return_exceptions=True
+        )
+        if isinstance(user_preferences, Exception):
+            raise user_preferences
+        
+        candidates = []
+        for result in source_results:
+            if isinstance(result, Exception):
+                logger.warning(f"Candidate source failed for user {user_id}: {result}")
+                continue
+            candidates.extend(result)
+        
+        # Remove duplicates (keep first occurrence; sources carry different features for
+        # the same post, so a later duplicate must not replace the earlier one)
+        unique_by_id: Dict[UUID, CandidatePost] = {}
         for candidate in candidates:
-            if candidate.id not in seen_ids:
-                seen_ids.add(candidate.id)
-                unique_candidates.append(candidate)
+            unique_by_id.setdefault(candidate.id, candidate)
+        unique_candidates = list(unique_by_id.values())
         
         # Apply heuristic ranking
         ranked_candidates = await self._rank_candidates(
             unique_candidates, user_id, user_preferences, user_latitude, user_longitude
         )
         
-        # Apply diversity and safety filters
-        filtered_candidates = self._apply_diversity_filters(ranked_candidates, user_id)
-        
-        # Apply exploration/exploitation balance
-        final_candidates = self._apply_exploration(filtered_candidates, limit)
+        # Apply diversity filters and exploration/exploitation balance
+        final_candidates = self._select_final(ranked_candidates, limit)
         
         processing_time = time.time() - start_time
         logger.info(
@@ -121,128 +315,152 @@ class RecommendationEngine:
         return final_candidates[:limit]
     
     async def _get_user_preferences(self, user_id: str) -> Dict[str, Any]:
-        """Get user topic and author affinities for personalization"""
+        """Get user topic and author affinities for personalization, cached per user"""
+        key = str(user_id)
+        entry = _preferences_cache.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        
+        # Concurrent misses for the same user wait for a single query
+        lock = _preferences_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = _preferences_cache.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+            
+            preferences = await self._fetch_user_preferences(user_id)
+            
+            if len(_preferences_cache) >= PREFERENCES_CACHE_MAX_ENTRIES:
+                # Drop the oldest 25% of entries
+                items_to_remove = len(_preferences_cache) // 4
+                for old_key in list(_preferences_cache.keys())[:items_to_remove]:
+                    del _preferences_cache[old_key]
+            _preferences_cache[key] = (preferences, time.monotonic() + settings.recs_cache_ttl_seconds)
+        
+        _preferences_locks.pop(key, None)
+        return preferences
+    
+    async def _fetch_user_preferences(self, user_id: str) -> Dict[str, Any]:
+        """Query user topic and author affinities"""
         
-        # Get topic affinities
-        topic_affinities = await self.db.fetch("""
-            SELECT t.name, uta.score
+        # Topic and author affinities in one round trip, told apart by `kind`
+        rows = await self._fetch("""
+            SELECT 'topic' AS kind, t.name, uta.score, NULL::uuid AS author_id, NULL::boolean AS is_following
             FROM user_topic_affinity uta
             JOIN topics t ON uta.topic_id = t.id
             WHERE uta.user_id = $1
-            ORDER BY uta.score DESC
-        """, user_id)
-        
-        # Get author affinities (people user engages with)
-        author_affinities = await self.db.fetch("""
-            SELECT author_id, score, is_following
+            UNION ALL
+            SELECT 'author' AS kind, NULL, score, author_id, is_following
             FROM user_author_affinity
             WHERE user_id = $1
             ORDER BY score DESC
         """, user_id)
         
+        topic_affinities = {}
+        author_affinities = {}
+        for row in rows:
+            if row['kind'] == 'topic':
+                topic_affinities[row['name']] = float(row['score'])
+            else:
+                author_affinities[str(row['author_id'])] = {
+                    "score": float(row['score']),
+                    "is_following": row['is_following']
+                }
+        
         return {
-            "topic_affinities": {row['name']: float(row['score']) for row in topic_affinities},
-            "author_affinities": {str(row['author_id']): {
-                "score": float(row['score']),
-                "is_following": row['is_following']
-            } for row in author_affinities}
+            "topic_affinities": topic_affinities,
+            "author_affinities": author_affinities
         }
     
     async def _generate_social_candidates(self, user_id: str, limit: int) -> List[CandidatePost]:
         """Generate candidates from followed authors and high-affinity authors"""
         
+        # Diversity caps are applied in SQL so one prolific followed author (or location)
+        # can't fill the whole source; _select_final still enforces them across sources
         query = """
-            SELECT DISTINCT
-                p.id, p.title, p.content, p.user_id as author_id, p.created_at,
-                p.latitude, p.longitude, p.location, p.tags,
-                u.username as author_username,
-                COALESCE(pq.quality_score, 0.1) as quality_score,
-                COALESCE(pq.engagement_rate, 0.0) as engagement_rate,
-                COALESCE(pq.recency_decay, 1.0) as recency_decay,
-                uaa.score as author_affinity_score
-            FROM posts p
-            JOIN users u ON p.user_id = u.id
-            LEFT JOIN post_quality pq ON p.id = pq.post_id
-            JOIN user_author_affinity uaa ON p.user_id = uaa.author_id
-            WHERE uaa.user_id = $1
-            AND p.created_at >= NOW() - INTERVAL '7 days'
-            AND (uaa.is_following = true OR uaa.score > 0.5)
-            ORDER BY uaa.score DESC, p.created_at DESC
+            SELECT * FROM (
+                SELECT
+                    p.id, p.title, p.content, p.user_id as author_id, p.created_at,
+                    p.latitude, p.longitude, p.location, p.tags,
+                    u.username as author_username,
+                    COALESCE(pq.quality_score, 0.1) as quality_score,
+                    COALESCE(pq.engagement_rate, 0.0) as engagement_rate,
+                    COALESCE(pq.recency_decay, 1.0) as recency_decay,
+                    uaa.score as author_affinity_score,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY p.user_id ORDER BY p.created_at DESC
+                    ) as author_rank,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY COALESCE(NULLIF(p.location, ''), 'general')
+                        ORDER BY uaa.score DESC, p.created_at DESC
+                    ) as topic_rank
+                FROM posts p
+                JOIN users u ON p.user_id = u.id
+                LEFT JOIN post_quality pq ON p.id = pq.post_id
+                JOIN user_author_affinity uaa ON p.user_id = uaa.author_id
+                WHERE uaa.user_id = $1
+                AND p.created_at >= NOW() - INTERVAL '7 days'
+                AND (uaa.is_following = true OR uaa.score > 0.5)
+            ) ranked
+            WHERE author_rank <= $3 AND topic_rank <= $4
+            ORDER BY author_affinity_score DESC, created_at DESC
             LIMIT $2
         """
         
-        rows = await self.db.fetch(query, user_id, limit * 2)  # Get more for diversity
+        rows = await self._fetch(
+            query, user_id, limit * 2,  # Get more for diversity
+            settings.recs_diversity_max_per_author, settings.recs_diversity_max_per_topic
+        )
         
-        candidates = []
-        for row in rows:
-            candidate = CandidatePost(
-                id=row['id'],
-                title=row['title'],
-                content=row['content'],
-                author_id=row['author_id'],
-                author_username=row['author_username'],
-                created_at=row['created_at'],
-                latitude=row['latitude'],
-                longitude=row['longitude'],
-                location=row['location'],
-                tags=row['tags'],
-                quality_score=float(row['quality_score']),
-                engagement_rate=float(row['engagement_rate']),
-                recency_decay=float(row['recency_decay']),
-                social_proximity=float(row['author_affinity_score']) if row['author_affinity_score'] else 0.0,
-                candidate_source="social"
+        return [
+            _candidate_from_row(
+                row, "social",
+                "followed_author" if row['author_affinity_score'] else "high_affinity_author",
+                social_proximity=float(row['author_affinity_score']) if row['author_affinity_score'] else 0.0
             )
-            candidate.ranking_reasons.append("followed_author" if row['author_affinity_score'] else "high_affinity_author")
-            candidates.append(candidate)
-        
-        return candidates
+            for row in rows
+        ]
     
     async def _generate_trending_candidates(self, limit: int) -> List[CandidatePost]:
         """Generate candidates from trending posts materialized view"""
         
+        # Per-author cap applied in SQL; the view only spans 48 hours, so the window is cheap
         query = """
-            SELECT 
-                post_id as id, title, content, author_id, post_created_at as created_at,
-                quality_score, engagement_rate, recency_decay,
-                u.username as author_username
-            FROM trending_posts tp
-            JOIN users u ON tp.author_id = u.id
+            SELECT * FROM (
+                SELECT 
+                    post_id as id, title, content, author_id, post_created_at as created_at,
+                    quality_score, engagement_rate, recency_decay,
+                    u.username as author_username,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY tp.author_id ORDER BY tp.quality_score DESC
+                    ) as author_rank
+                FROM trending_posts tp
+                JOIN users u ON tp.author_id = u.id
+            ) ranked
+            WHERE author_rank <= $2
             ORDER BY quality_score DESC
             LIMIT $1
         """
         
         try:
-            rows = await self.db.fetch(query, limit * 2)
+            rows = await self._fetch(query, limit * 2, settings.recs_diversity_max_per_author)
         except asyncpg.PostgresError as e:
             logger.warning(f"Could not fetch from trending_posts: {e}")
             return []
         
-        candidates = []
-        for row in rows:
-            candidate = CandidatePost(
-                id=row['id'],
-                title=row['title'],
-                content=row['content'],
-                author_id=row['author_id'],
-                author_username=row['author_username'],
-                created_at=row['created_at'],
-                quality_score=float(row['quality_score']),
-                engagement_rate=float(row['engagement_rate']),
-                recency_decay=float(row['recency_decay']),
-                candidate_source="trending"
-            )
-            candidate.ranking_reasons.append("trending")
-            candidates.append(candidate)
-        
-        return candidates
+        return [_candidate_from_row(row, "trending", "trending") for row in rows]
     
     async def _generate_locality_candidates(
         self, user_lat: float, user_lon: float, limit: int
     ) -> List[CandidatePost]:
         """Generate candidates from geographically nearby posts"""
         
-        # Use PostGIS for geographic queries within configured radius
+        # Use PostGIS for geographic queries within configured radius; the user's point is
+        # built once from numeric parameters instead of formatting WKT text per row
         query = """
+            WITH origin AS (
+                SELECT ST_SetSRID(ST_MakePoint($2, $1), 4326)::geography as geog
+            )
             SELECT 
                 p.id, p.title, p.content, p.user_id as author_id, p.created_at,
                 p.latitude, p.longitude, p.location, p.tags,
@@ -251,17 +469,18 @@ class RecommendationEngine:
                 COALESCE(pq.engagement_rate, 0.0) as engagement_rate,
                 COALESCE(pq.recency_decay, 1.0) as recency_decay,
                 ST_Distance(
-                    ST_GeogFromText('POINT(' || $2 || ' ' || $1 || ')'),
-                    ST_GeogFromText('POINT(' || p.longitude || ' ' || p.latitude || ')')
+                    o.geog,
+                    ST_SetSRID(ST_MakePoint(p.longitude, p.latitude), 4326)::geography
                 ) as distance_meters
             FROM posts p
+            CROSS JOIN origin o
             JOIN users u ON p.user_id = u.id
             LEFT JOIN post_quality pq ON p.id = pq.post_id
             WHERE p.latitude IS NOT NULL AND p.longitude IS NOT NULL
             AND p.created_at >= NOW() - INTERVAL '14 days'
             AND ST_DWithin(
-                ST_GeogFromText('POINT(' || $2 || ' ' || $1 || ')'),
-                ST_GeogFromText('POINT(' || p.longitude || ' ' || p.latitude || ')'),
+                o.geog,
+                ST_SetSRID(ST_MakePoint(p.longitude, p.latitude), 4326)::geography,
                 $3
             )
             ORDER BY distance_meters ASC, pq.quality_score DESC NULLS LAST
@@ -269,38 +488,23 @@ class RecommendationEngine:
         """
         
         try:
-            rows = await self.db.fetch(
+            rows = await self._fetch(
                 query, user_lat, user_lon, settings.max_search_radius_meters, limit * 2
             )
         except asyncpg.PostgresError as e:
             logger.warning(f"PostGIS locality query failed: {e}")
             return []
         
+        # Calculate locality match score (closer = higher score)
+        inv_radius_km = 1000.0 / settings.max_search_radius_meters
         candidates = []
         for row in rows:
-            # Calculate locality match score (closer = higher score)
             distance_km = row['distance_meters'] / 1000.0
-            locality_score = max(0.0, 1.0 - (distance_km / (settings.max_search_radius_meters / 1000.0)))
+            locality_score = max(0.0, 1.0 - distance_km * inv_radius_km)
             
-            candidate = CandidatePost(
-                id=row['id'],
-                title=row['title'],
-                content=row['content'],
-                author_id=row['author_id'],
-                author_username=row['author_username'],
-                created_at=row['created_at'],
-                latitude=row['latitude'],
-                longitude=row['longitude'],
-                location=row['location'],
-                tags=row['tags'],
-                quality_score=float(row['quality_score']),
-                engagement_rate=float(row['engagement_rate']),
-                recency_decay=float(row['recency_decay']),
-                locality_match=locality_score,
-                candidate_source="locality"
-            )
-            candidate.ranking_reasons.append(f"nearby_{distance_km:.1f}km")
-            candidates.append(candidate)
+            candidates.append(_candidate_from_row(
+                row, "locality", f"nearby_{distance_km:.1f}km", locality_match=locality_score
+            ))
         
         return candidates
     
@@ -323,30 +527,9 @@ class RecommendationEngine:
             LIMIT $1
         """
         
-        rows = await self.db.fetch(query, limit * 2)
+        rows = await self._fetch(query, limit * 2)
         
-        candidates = []
-        for row in rows:
-            candidate = CandidatePost(
-                id=row['id'],
-                title=row['title'],
-                content=row['content'],
-                author_id=row['author_id'],
-                author_username=row['author_username'],
-                created_at=row['created_at'],
-                latitude=row['latitude'],
-                longitude=row['longitude'],
-                location=row['location'],
-                tags=row['tags'],
-                quality_score=float(row['quality_score']),
-                engagement_rate=float(row['engagement_rate']),
-                recency_decay=float(row['recency_decay']),
-                candidate_source="recency"
-            )
-            candidate.ranking_reasons.append("recent")
-            candidates.append(candidate)
-        
-        return candidates
+        return [_candidate_from_row(row, "recency", "recent") for row in rows]
     
     async def _rank_candidates(
         self,
@@ -358,107 +541,133 @@ class RecommendationEngine:
     ) -> List[CandidatePost]:
         """Apply heuristic ranking using weighted features"""
         
-        # Calculate personal affinity scores for candidates
+        # Weights are read once per request rather than per candidate
+        w_personal = settings.recs_weight_personal_affinity
+        w_engagement = settings.recs_weight_engagement_rate
+        w_recency = settings.recs_weight_recency_decay
+        w_social = settings.recs_weight_social_proximity
+        w_locality = settings.recs_weight_locality_match
+        author_affinities = user_preferences["author_affinities"]
+        
+        # Topic names are lowercased once per request and ordered by score, so the first
+        # match is the best one; results are remembered per distinct location/tag string
+        topic_items = sorted(
+            ((topic_name.lower(), score) for topic_name, score in user_preferences["topic_affinities"].items()),
+            key=itemgetter(1),
+            reverse=True
+        )
+        topic_matches: Dict[str, float] = {}
+        
+        def match_topics(text: str) -> float:
+            text_lower = text.lower()
+            best = topic_matches.get(text_lower)
+            if best is None:
+                best = 0.0
+                for topic_name, score in topic_items:
+                    if topic_name in text_lower:
+                        best = max(score, 0.0)
+                        break
+                topic_matches[text_lower] = best
+            return best
+        
+        # Compute affinity and final score in a single pass over the candidates
         for candidate in candidates:
             # Author affinity
-            author_key = str(candidate.author_id)
-            if author_key in user_preferences["author_affinities"]:
-                candidate.personal_affinity = user_preferences["author_affinities"][author_key]["score"]
+            author_affinity = author_affinities.get(str(candidate.author_id))
+            if author_affinity is not None:
+                candidate.personal_affinity = author_affinity["score"]
             
             # Topic affinity (simplified - using location and tags)
             topic_affinity = 0.0
-            if candidate.location:
+            if topic_items:
                 # Simple keyword matching with topics
-                location_lower = candidate.location.lower()
-                for topic_name, score in user_preferences["topic_affinities"].items():
-                    if topic_name.lower() in location_lower:
-                        topic_affinity = max(topic_affinity, score)
+                if candidate.location:
+                    topic_affinity = match_topics(candidate.location)
+                
+                # Check tags as well
+                if candidate.tags:
+                    for tag in candidate.tags:
+                        if tag:
+                            topic_affinity = max(topic_affinity, match_topics(tag))
             
-            # Check tags as well
-            if candidate.tags:
-                for tag in candidate.tags:
-                    tag_lower = tag.lower() if tag else ""
-                    for topic_name, score in user_preferences["topic_affinities"].items():
-                        if topic_name.lower() in tag_lower:
-                            topic_affinity = max(topic_affinity, score)
+            personal_affinity = max(candidate.personal_affinity, topic_affinity * 0.8)
+            candidate.personal_affinity = personal_affinity
             
-            candidate.personal_affinity = max(candidate.personal_affinity, topic_affinity * 0.8)
-        
-        # Calculate final ranking scores
-        for candidate in candidates:
-            score = (
-                settings.recs_weight_personal_affinity * candidate.personal_affinity +
-                settings.recs_weight_engagement_rate * candidate.engagement_rate +
-                settings.recs_weight_recency_decay * candidate.recency_decay +
-                settings.recs_weight_social_proximity * candidate.social_proximity +
-                settings.recs_weight_locality_match * candidate.locality_match
+            # Weighted features plus a quality baseline; stored in quality_score for sorting
+            candidate.quality_score = (
+                w_personal * personal_affinity +
+                w_engagement * candidate.engagement_rate +
+                w_recency * candidate.recency_decay +
+                w_social * candidate.social_proximity +
+                w_locality * candidate.locality_match +
+                candidate.quality_score * 0.1
             )
-            
-            # Add quality baseline
-            score += candidate.quality_score * 0.1
-            
-            # Store score for sorting (abuse one of the existing fields)
-            candidate.quality_score = score
         
         # Sort by final score
-        candidates.sort(key=lambda c: c.quality_score, reverse=True)
+        candidates.sort(key=attrgetter("quality_score"), reverse=True)
         
         return candidates
     
-    def _apply_diversity_filters(self, candidates: List[CandidatePost], user_id: str) -> List[CandidatePost]:
-        """Apply diversity caps (max per author/topic) and overexposure filtering"""
+    def _select_final(self, candidates: List[CandidatePost], limit: int) -> List[CandidatePost]:
+        """
+        Apply diversity caps (max per author/topic) and exploration vs exploitation balance
+        in a single pass over the ranked candidates
+        """
+        
+        exploration_slots = 0
+        if settings.recs_exploration_rate > 0:
+            exploration_slots = int(limit * settings.recs_exploration_rate)
+        exploitation_slots = limit - exploration_slots
+        max_per_author = settings.recs_diversity_max_per_author
+        max_per_topic = settings.recs_diversity_max_per_topic
         
         author_counts = {}
         topic_counts = {}
-        filtered = []
+        exploitation_candidates = []
+        # Reservoir sample of the candidates that pass the caps after the exploitation slots fill
+        exploration_candidates = []
+        pool_size = 0
         
         for candidate in candidates:
             # Check author diversity
             author_id = str(candidate.author_id)
             author_count = author_counts.get(author_id, 0)
-            if author_count >= settings.recs_diversity_max_per_author:
+            if author_count >= max_per_author:
                 continue
             
             # Check topic diversity (simplified - use location as topic)
             topic = candidate.location or "general"
             topic_count = topic_counts.get(topic, 0)
-            if topic_count >= settings.recs_diversity_max_per_topic:
+            if topic_count >= max_per_topic:
                 continue
             
             # TODO: Check overexposure (requires checking recent impressions)
             # This would query interactions table for recent impressions of this post
             
-            # Add to filtered list and update counts
-            filtered.append(candidate)
             author_counts[author_id] = author_count + 1
             topic_counts[topic] = topic_count + 1
-        
-        return filtered
-    
-    def _apply_exploration(self, candidates: List[CandidatePost], limit: int) -> List[CandidatePost]:
-        """Apply exploration vs exploitation balance"""
-        
-        if not candidates or settings.recs_exploration_rate <= 0:
-            return candidates
-        
-        # Calculate exploration slots
-        exploration_slots = int(limit * settings.recs_exploration_rate)
-        exploitation_slots = limit - exploration_slots
-        
-        # Split candidates into exploitation (top scored) and exploration (random from rest)
-        exploitation_candidates = candidates[:exploitation_slots]
-        
-        if len(candidates) > exploitation_slots:
-            exploration_pool = candidates[exploitation_slots:]
-            exploration_candidates = random.sample(
-                exploration_pool, 
-                min(exploration_slots, len(exploration_pool))
-            )
-        else:
-            exploration_candidates = []
+            
+            # Top scored candidates fill the exploitation slots
+            if len(exploitation_candidates) < exploitation_slots:
+                exploitation_candidates.append(candidate)
+                continue
+            if not exploration_slots:
+                break
+            
+            # The rest compete for exploration slots at random
+            pool_size += 1
+            if len(exploration_candidates) < exploration_slots:
+                exploration_candidates.append(candidate)
+            else:
+                slot = _exploration_rng.randrange(pool_size)
+                if slot < exploration_slots:
+                    exploration_candidates[slot] = candidate
+        
+        if settings.recs_exploration_rate <= 0:
+            return exploitation_candidates
         
         # Merge and shuffle to avoid obvious patterns
         final_candidates = exploitation_candidates + exploration_candidates
-        random.shuffle(final_candidates)
+        _exploration_rng.shuffle(final_candidates)
         
         return final_candidates
@@ -4,13 +4,16 @@ Handles all eVote-related operations including voting, statistics, and trends
 """
 
 import logging
-from typing import Optional, Dict, Any, List
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from uuid import UUID
 from datetime import date, timedelta, datetime
+import orjson
 from fastapi import HTTPException
 
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 from app.db.database import db_manager
+from app.db.redis_client import redis_manager
 from app.db.queries import RepresentativeEVoteQueries
 from app.models.pydantic_models import (
     RepresentativeEVoteResponse,
@@ -26,160 +29,229 @@ from app.models.pydantic_models import (
 
 logger = logging.getLogger(__name__)
 
+# Representative stats (percentage and rank) and the top list aggregate over every
+# representative, so they are cached briefly as JSON. With Redis the cache is shared by
+# all workers; otherwise each worker keeps its own copy.
+EVOTE_CACHE_TTL_SECONDS = 30
+EVOTE_CACHE_MAX_ENTRIES = 10_000
+
+# A user's eVote status only changes through their own add/remove, which drops the cached
+# status. Reads only fill an empty key, so a read that raced a write can't overwrite a newer
+# entry, and entries expire quickly in case it filled the key after the drop. Without Redis
+# other workers can't see the drop, so their copies expire quickly too.
+EVOTE_STATUS_CACHE_TTL_SECONDS = 3
+REDIS_EVOTE_STATUS_CACHE_TTL_SECONDS = 5
+
+# key -> (payload, expires_at)
+_evote_cache: Dict[str, Tuple[bytes, float]] = {}
+
+def _evote_stats_key(rep_id: UUID) -> str:
+    return f"evote:stats:{rep_id}"
+
+def _evote_top_key(limit: int) -> str:
+    return f"evote:top:{limit}"
+
+def _evote_status_key(user_id: UUID, rep_id: UUID) -> str:
+    return f"evote:status:{user_id}:{rep_id}"
+
+async def _get_cached_evote_payload(key: str) -> Optional[bytes]:
+    """Return a cached JSON payload, or None on a miss"""
+    client = redis_manager.get_client()
+    if client is None:
+        entry = _evote_cache.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+    
+    try:
+        return await client.get(key)
+    except Exception as e:
+        logger.warning(f"Failed to read cached eVote data {key}: {e}")
+        return None
+
+async def _cache_evote_payload(
+    key: str,
+    payload: bytes,
+    ttl: int = EVOTE_CACHE_TTL_SECONDS,
+    redis_ttl: int = EVOTE_CACHE_TTL_SECONDS,
+    only_if_missing: bool = False
+):
+    """
+    Cache a JSON payload for ttl seconds per worker, or redis_ttl seconds in Redis
+    With only_if_missing, an existing Redis entry is left in place (SET NX)
+    """
+    client = redis_manager.get_client()
+    if client is None:
+        if key not in _evote_cache and len(_evote_cache) >= EVOTE_CACHE_MAX_ENTRIES:
+            # Drop the oldest 25% of entries
+            items_to_remove = len(_evote_cache) // 4
+            for old_key in list(_evote_cache.keys())[:items_to_remove]:
+                del _evote_cache[old_key]
+        
+        _evote_cache[key] = (payload, time.monotonic() + ttl)
+        return
+    
+    try:
+        await client.set(key, payload, ex=redis_ttl, nx=only_if_missing)
+    except Exception as e:
+        logger.warning(f"Failed to cache eVote data {key}: {e}")
+
+async def _cache_evote_status(user_id: UUID, rep_id: UUID, status: RepresentativeEVoteStatus):
+    """Cache a user's eVote status for a representative read from the database"""
+    await _cache_evote_payload(
+        _evote_status_key(user_id, rep_id),
+        status.model_dump_json().encode(),
+        ttl=EVOTE_STATUS_CACHE_TTL_SECONDS,
+        redis_ttl=REDIS_EVOTE_STATUS_CACHE_TTL_SECONDS,
+        only_if_missing=True
+    )
+
+async def _drop_cached_evote_data(user_id: UUID, rep_id: UUID):
+    """Invalidate a representative's cached stats and the user's cached status after an eVote write"""
+    keys = (_evote_stats_key(rep_id), _evote_status_key(user_id, rep_id))
+    for key in keys:
+        _evote_cache.pop(key, None)
+    
+    client = redis_manager.get_client()
+    if client is None:
+        return
+    
+    try:
+        await client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cached eVote data for representative {rep_id}: {e}")
+
 class RepresentativeEVoteService:
     """Service for representative eVote operations"""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
         self.queries = RepresentativeEVoteQueries()
     
     async def evote_for_representative(self, user_id: UUID, rep_id: UUID) -> RepresentativeEVoteResponse:
         """Add eVote for representative"""
         async with db_manager.get_connection() as conn:
             async with conn.transaction():
-                # Check if user already voted
-                existing_vote = await conn.fetchrow(self.queries.CHECK_USER_EVOTE, user_id, rep_id)
-                
-                if existing_vote:
-                    raise HTTPException(
-                        status_code=400, 
-                        detail="User has already eVoted for this representative"
+                await conn.execute(self.queries.LOCK_REPRESENTATIVE_FOR_EVOTE, rep_id)
+                evoted_at = await conn.fetchval(self.queries.ADD_EVOTE, user_id, rep_id)
+                total_evotes = None
+                if evoted_at is not None:
+                    total_evotes = await conn.fetchval(
+                        self.queries.RECORD_DAILY_EVOTE_TOTAL, rep_id, date.today()
                     )
-                
-                # Add the eVote
-                evote_record = await conn.fetchrow(self.queries.ADD_EVOTE, user_id, rep_id)
-                
-                if not evote_record:
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to add eVote"
-                    )
-                
-                # Update daily count (+1)
-                await self._update_daily_count(conn, rep_id, 1)
-                
-                # Get updated total
-                total_evotes = await conn.fetchval(self.queries.GET_TOTAL_EVOTES, rep_id)
-                
-                logger.info(f"User {user_id} eVoted for representative {rep_id}")
-                
-                return RepresentativeEVoteResponse(
-                    success=True,
-                    message="eVote added successfully",
-                    has_evoted=True,
-                    total_evotes=total_evotes or 0
-                )
+        
+        if evoted_at is None:
+            raise HTTPException(
+                status_code=400, 
+                detail="User has already eVoted for this representative"
+            )
+        
+        await _drop_cached_evote_data(user_id, rep_id)
+        logger.info(f"User {user_id} eVoted for representative {rep_id}")
+        
+        return RepresentativeEVoteResponse(
+            success=True,
+            message="eVote added successfully",
+            has_evoted=True,
+            total_evotes=total_evotes or 0
+        )
     
     async def remove_evote(self, user_id: UUID, rep_id: UUID) -> RepresentativeEVoteResponse:
         """Remove eVote for representative"""
         async with db_manager.get_connection() as conn:
             async with conn.transaction():
-                # Check if user has voted (must exist to remove)
-                existing_vote = await conn.fetchrow(self.queries.CHECK_USER_EVOTE, user_id, rep_id)
-                
-                if not existing_vote:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="User has not eVoted for this representative"
+                await conn.execute(self.queries.LOCK_REPRESENTATIVE_FOR_EVOTE, rep_id)
+                removed_id = await conn.fetchval(self.queries.REMOVE_EVOTE, user_id, rep_id)
+                total_evotes = None
+                if removed_id is not None:
+                    total_evotes = await conn.fetchval(
+                        self.queries.RECORD_DAILY_EVOTE_TOTAL, rep_id, date.today()
                     )
-                
-                # Remove the eVote
-                removed_record = await conn.fetchrow(self.queries.REMOVE_EVOTE, user_id, rep_id)
-                
-                if not removed_record:
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to remove eVote"
-                    )
-                
-                # Update daily count (-1)
-                await self._update_daily_count(conn, rep_id, -1)
-                
-                # Get updated total
-                total_evotes = await conn.fetchval(self.queries.GET_TOTAL_EVOTES, rep_id)
-                
-                logger.info(f"User {user_id} removed eVote for representative {rep_id}")
-                
-                return RepresentativeEVoteResponse(
-                    success=True,
-                    message="eVote removed successfully",
-                    has_evoted=False,
-                    total_evotes=total_evotes or 0
-                )
+        
+        if removed_id is None:
+            raise HTTPException(
+                status_code=400,
+                detail="User has not eVoted for this representative"
+            )
+        
+        await _drop_cached_evote_data(user_id, rep_id)
+        logger.info(f"User {user_id} removed eVote for representative {rep_id}")
+        
+        return RepresentativeEVoteResponse(
+            success=True,
+            message="eVote removed successfully",
+            has_evoted=False,
+            total_evotes=total_evotes or 0
+        )
     
     async def get_user_evote_status(self, user_id: UUID, rep_id: UUID) -> RepresentativeEVoteStatus:
-        """Check if user has eVoted for representative"""
+        """Check if user has eVoted for representative, served from the eVote cache when possible"""
+        cached = await _get_cached_evote_payload(_evote_status_key(user_id, rep_id))
+        if cached is not None:
+            return RepresentativeEVoteStatus.model_validate_json(cached)
+        
         async with db_manager.get_connection() as conn:
             evote_record = await conn.fetchrow(self.queries.CHECK_USER_EVOTE, user_id, rep_id)
-            
-            if evote_record:
-                return RepresentativeEVoteStatus(
-                    has_evoted=True,
-                    evoted_at=evote_record['created_at']
-                )
-            else:
-                return RepresentativeEVoteStatus(has_evoted=False)
+        
+        if evote_record:
+            status = RepresentativeEVoteStatus(
+                has_evoted=True,
+                evoted_at=evote_record['created_at']
+            )
+        else:
+            status = RepresentativeEVoteStatus(has_evoted=False)
+        
+        await _cache_evote_status(user_id, rep_id, status)
+        return status
     
     async def get_representative_evote_stats(self, rep_id: UUID) -> RepresentativeEVoteStats:
-        """Get eVote statistics for representative"""
+        """Get eVote statistics for representative, served from the eVote cache when possible"""
+        key = _evote_stats_key(rep_id)
+        cached = await _get_cached_evote_payload(key)
+        if cached is not None:
+            return RepresentativeEVoteStats.model_validate_json(cached)
+        
         async with db_manager.get_connection() as conn:
             stats = await conn.fetchrow(self.queries.GET_EVOTE_STATS, rep_id)
-            
-            if not stats:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Representative not found"
-                )
-            
-            return RepresentativeEVoteStats(
-                representative_id=rep_id,
-                total_evotes=stats['total_evotes'] or 0,
-                evote_percentage=stats['evote_percentage'],
-                rank=stats['rank']
+        
+        if not stats:
+            raise HTTPException(
+                status_code=404,
+                detail="Representative not found"
             )
+        
+        result = RepresentativeEVoteStats(
+            representative_id=rep_id,
+            total_evotes=stats['total_evotes'] or 0,
+            evote_percentage=stats['evote_percentage'],
+            rank=stats['rank']
+        )
+        await _cache_evote_payload(key, result.model_dump_json().encode())
+        return result
     
     async def get_evote_trends(self, rep_id: UUID, days: int = 30) -> RepresentativeEVoteTrends:
         """Get eVote trends for line graphs"""
         start_date = date.today() - timedelta(days=days)
         
         async with db_manager.get_connection() as conn:
-            # Get all records for this representative within the date range
-            db_records = await conn.fetch(self.queries.GET_EVOTE_TRENDS, rep_id, start_date)
-            
-            # Convert to dictionary for easy lookup
-            records_dict = {record['date']: record['total_evotes'] for record in db_records}
-            
-            # Get the baseline count (most recent count before our range)
-            baseline = await conn.fetchval(self.queries.GET_LAST_DAILY_COUNT, rep_id, start_date)
-            current_count = baseline or 0
-            
-            # Generate the trend data
-            trends = []
-            start_count = current_count
-            
-            for i in range(days + 1):
-                current_date = start_date + timedelta(days=i)
-                
-                # If there's a record for this date, use it
-                if current_date in records_dict:
-                    current_count = records_dict[current_date]
-                
-                # Add the current count
-                trends.append(EVoteTrendData(
-                    date=current_date.isoformat(),
-                    total_evotes=current_count
-                ))
-            
-            # Calculate period change
-            period_change = current_count - start_count
-            
-            return RepresentativeEVoteTrends(
-                representative_id=rep_id,
-                period_days=days,
-                trends=trends,
-                current_total=current_count,
-                period_change=period_change
-            )
+            # Days are scaffolded, forward-filled and formatted in SQL; the first row is the
+            # baseline (the count on the day before the range)
+            rows = await conn.fetch(self.queries.GET_EVOTE_TRENDS, rep_id, start_date, date.today())
+        
+        start_count = rows[0]['total_evotes']
+        trends = [
+            EVoteTrendData(date=row['date'], total_evotes=row['total_evotes'])
+            for row in rows[1:]
+        ]
+        current_count = trends[-1].total_evotes if trends else start_count
+        
+        return RepresentativeEVoteTrends(
+            representative_id=rep_id,
+            period_days=days,
+            trends=trends,
+            current_total=current_count,
+            period_change=current_count - start_count
+        )
     
     async def get_user_evote_history(
         self, 
@@ -191,10 +263,7 @@ class RepresentativeEVoteService:
         offset = (page - 1) * limit
         
         async with db_manager.get_connection() as conn:
-            # Get total count
-            total_count = await conn.fetchval(self.queries.GET_USER_EVOTES_COUNT, user_id) or 0
-            
-            # Get paginated history
+            # Get paginated history; each row carries the total count
             history_records = await conn.fetch(
                 self.queries.GET_USER_EVOTE_HISTORY, 
                 user_id, 
@@ -202,11 +271,20 @@ class RepresentativeEVoteService:
                 offset
             )
             
-            # Build response objects
+            if history_records:
+                total_count = history_records[0]['total_count']
+            elif offset:
+                # A page past the end has no rows to carry the count
+                total_count = await conn.fetchval(self.queries.GET_USER_EVOTES_COUNT, user_id) or 0
+            else:
+                total_count = 0
+            
+            # Build response objects. The nested models are filled straight from typed
+            # columns (UUID, datetime, int, ...), so they skip per-field validation
             evotes = []
             for record in history_records:
                 # Build title info
-                title_info = TitleInfo(
+                title_info = TitleInfo.model_construct(
                     id=record['title_id'],
                     title_name=record['title_name'],
                     abbreviation=record['abbreviation'],
@@ -222,7 +300,7 @@ class RepresentativeEVoteService:
                 )
                 
                 # Build jurisdiction info
-                jurisdiction_info = JurisdictionInfo(
+                jurisdiction_info = JurisdictionInfo.model_construct(
                     id=record['jurisdiction_id'],
                     name=record['jurisdiction_name'],
                     level_name=record['jurisdiction_level_name'],
@@ -234,7 +312,7 @@ class RepresentativeEVoteService:
                 
                 evotes.append(UserEVoteHistory(
                     representative_id=record['representative_id'],
-                    representative_name=f"{title_info.title_name} - {jurisdiction_info.name}",
+                    representative_name=record['representative_name'],
                     title_info=title_info,
                     jurisdiction_info=jurisdiction_info,
                     evoted_at=record['evoted_at'],
@@ -248,40 +326,23 @@ class RepresentativeEVoteService:
             )
     
     async def get_top_evoted_representatives(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get top eVoted representatives"""
+        """Get top eVoted representatives, served from the eVote cache when possible"""
+        key = _evote_top_key(limit)
+        cached = await _get_cached_evote_payload(key)
+        if cached is not None:
+            return orjson.loads(cached)
+        
         async with db_manager.get_connection() as conn:
             records = await conn.fetch(self.queries.GET_TOP_EVOTED_REPRESENTATIVES, limit)
-            
-            return [
-                {
-                    "representative_id": record['id'],
-                    "evote_count": record['evote_count'],
-                    "title_name": record['title_name'],
-                    "jurisdiction_name": record['jurisdiction_name']
-                }
-                for record in records
-            ]
-    
-    async def _update_daily_count(self, conn, rep_id: UUID, increment: int):
-        """Update today's cumulative count ONLY if there's a transaction"""
-        today = date.today()
         
-        # Check if today already has a record
-        today_count = await conn.fetchval(self.queries.GET_TODAY_DAILY_COUNT, rep_id, today)
-        
-        if today_count is not None:
-            # Update existing record for today
-            new_total = today_count + increment
-            await conn.execute(self.queries.UPDATE_DAILY_COUNT, rep_id, today, new_total)
-            logger.info(f"Updated daily count for rep {rep_id} on {today}: {today_count} -> {new_total}")
-        else:
-            # No record for today yet, get the most recent count
-            last_count = await conn.fetchval(self.queries.GET_LAST_DAILY_COUNT, rep_id, today)
-            
-            # If no previous records exist, start from 0
-            previous_count = last_count or 0
-            new_total = previous_count + increment
-            
-            # Create new record for today (only because there's a transaction)
-            await conn.execute(self.queries.INSERT_DAILY_COUNT, rep_id, today, new_total)
-            logger.info(f"Created daily count for rep {rep_id} on {today}: {new_total} (previous: {previous_count})")
+        representatives = [
+            {
+                "representative_id": str(record['id']),
+                "evote_count": record['evote_count'],
+                "title_name": record['title_name'],
+                "jurisdiction_name": record['jurisdiction_name']
+            }
+            for record in records
+        ]
+        await _cache_evote_payload(key, orjson.dumps(representatives))
+        return representatives
@@ -5,7 +5,7 @@ import logging
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 from fastapi import HTTPException
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 from app.db.database import db_manager
 
 logger = logging.getLogger(__name__)
@@ -14,7 +14,7 @@ class RepresentativeService:
     """Service for representative-related operations using raw SQL"""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
     
     async def get_available_representatives(
         self, 
@@ -487,3 +487,6 @@ class RepresentativeService:
             return representatives
             
         # Remove generic Exception catch - let FastAPI handle unexpected errors
+
+# Global representative service instance
+representative_service = RepresentativeService()
@@ -10,7 +10,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timezone
 from fastapi import HTTPException
 
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 from app.services.search_formatter import SearchResultFormatter, SearchResultAggregator, SearchPaginator, SearchHighlighter
 from app.services.search_suggestions import SearchSuggestionService, PopularTermsAnalyzer
 
@@ -24,7 +24,7 @@ class SearchService:
     """
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
         self.suggestion_service = SearchSuggestionService()
         self.popular_terms_analyzer = PopularTermsAnalyzer()
     
@@ -9,7 +9,7 @@ from datetime import datetime, timezone, timedelta
 from collections import Counter
 import re
 
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +18,7 @@ class SearchSuggestionService:
     """Service for generating intelligent search suggestions."""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
     
     async def get_suggestions(
         self,
@@ -546,7 +546,7 @@ class PopularTermsAnalyzer:
     """Analyzes and provides insights on popular search terms."""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
     
     async def get_popular_terms_analysis(
         self,
@@ -625,7 +625,7 @@ class PopularTermsAnalyzer:
             MIN(created_at) as first_searched,
             array_agg(DISTINCT search_type) as searched_entities
         FROM search_analytics
-        WHERE created_at > NOW() - INTERVAL '{days} days'
+        WHERE created_at > NOW() - $1::int * INTERVAL '1 day'
         {entity_filter}
         GROUP BY query
         ORDER BY total_searches DESC, unique_searchers DESC
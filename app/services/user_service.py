@@ -5,7 +5,7 @@ import logging
 from typing import Optional, Dict, Any
 from uuid import UUID
 from fastapi import HTTPException
-from app.services.db_service import DatabaseService
+from app.services.db_service import db_service
 from app.core.security import get_password_hash
 from app.models.pydantic_models import TitleResponse
 
@@ -15,7 +15,7 @@ class UserService:
     """Service for user-related operations using raw SQL"""
     
     def __init__(self):
-        self.db_service = DatabaseService()
+        self.db_service = db_service
     
     def _format_user_with_title(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Format user data to include title information"""
@@ -95,12 +95,12 @@ class UserService:
         # Check if email/username are being changed and not already taken
         if user_data.get('email'):
             existing_user = await self.db_service.get_user_by_email(user_data['email'])
-            if existing_user and UUID(existing_user['id']) != user_id:
+            if existing_user and existing_user['id'] != user_id:
                 raise HTTPException(status_code=400, detail="Email already registered")
         
         if user_data.get('username'):
             existing_user = await self.db_service.get_user_by_username(user_data['username'])
-            if existing_user and UUID(existing_user['id']) != user_id:
+            if existing_user and existing_user['id'] != user_id:
                 raise HTTPException(status_code=400, detail="Username already taken")
         
         # Hash password if being updated
@@ -18,6 +18,9 @@ from ..core.websocket_config import get_websocket_config, WebSocketMode
 
 logger = logging.getLogger(__name__)
 
+# Maximum pre-serialized messages buffered per connection; further sends are refused
+SEND_QUEUE_MAXSIZE = 256
+
 class EventType(str, Enum):
     """Types of real-time search events"""
     NEW_RESULT = "new_result"
@@ -105,6 +108,14 @@ class ConnectionManager:
         # Active WebSocket connections
         self.connections: Dict[str, ConnectionInfo] = {}
         
+        # User index - maps user_id to connection IDs
+        self.user_index: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Outgoing (payload, result future) pairs per connection, drained by a sender task each.
+        # Every write to a socket goes through its queue so messages are sent in order.
+        self.send_queues: Dict[str, asyncio.Queue] = {}
+        self._sender_tasks: Dict[str, asyncio.Task] = {}
+        
         # Query subscriptions - maps query to connection IDs
         self.query_subscriptions: Dict[str, Set[str]] = defaultdict(set)
         
@@ -145,6 +156,13 @@ class ConnectionManager:
         connection_info = ConnectionInfo(websocket, user_id)
         
         self.connections[connection_id] = connection_info
+        send_queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_MAXSIZE)
+        self.send_queues[connection_id] = send_queue
+        self._sender_tasks[connection_id] = asyncio.create_task(
+            self._drain_send_queue(connection_id, send_queue)
+        )
+        if user_id:
+            self.user_index[user_id].add(connection_id)
         
         logger.info(f"WebSocket connected: {connection_id}, User: {user_id}")
         
@@ -160,6 +178,7 @@ class ConnectionManager:
         # Deliver pending notifications if user is authenticated
         if user_id:
             from app.services.notification_service import notification_service
+            await notification_service.track_presence(user_id, connection_id, True)
             await notification_service.deliver_pending_notifications(user_id, connection_id)
         
         # Start background tasks if not running
@@ -179,6 +198,25 @@ class ConnectionManager:
             for subscription_id in list(connection_info.subscriptions.keys()):
                 await self._unsubscribe_from_query(connection_id, subscription_id)
             
+            # Remove from user index
+            if connection_info.user_id:
+                user_connections = self.user_index.get(connection_info.user_id)
+                if user_connections is not None:
+                    user_connections.discard(connection_id)
+                    if not user_connections:
+                        del self.user_index[connection_info.user_id]
+                
+                from app.services.notification_service import notification_service
+                await notification_service.track_presence(connection_info.user_id, connection_id, False)
+            
+            # Stop the sender task (unless the sender itself is handling the disconnect)
+            send_queue = self.send_queues.pop(connection_id, None)
+            if send_queue is not None:
+                self._fail_queued(send_queue)
+            sender_task = self._sender_tasks.pop(connection_id, None)
+            if sender_task is not None and sender_task is not asyncio.current_task():
+                sender_task.cancel()
+            
             # Remove connection
             del self.connections[connection_id]
             
@@ -335,30 +373,74 @@ class ConnectionManager:
 
     async def _send_to_connection(self, connection_id: str, message: Dict[str, Any]):
         """Send a message to a specific connection with rate limiting"""
-        if connection_id not in self.connections:
+        return await self._send_bytes(connection_id, json.dumps(message).encode("utf-8"))
+
+    async def _send_bytes(self, connection_id: str, payload: bytes) -> bool:
+        """
+        Send a pre-serialized JSON payload to a connection, skipping re-serialization.
+        The payload goes through the connection's send queue; returns whether it was written.
+        """
+        send_queue = self.send_queues.get(connection_id)
+        if send_queue is None:
             return False
         
-        connection_info = self.connections[connection_id]
-        
         # Rate limiting check
         if not self._check_rate_limit(connection_id):
             logger.warning(f"Rate limit exceeded for connection {connection_id}")
             return False
         
+        result = asyncio.get_running_loop().create_future()
         try:
-            await connection_info.websocket.send_text(json.dumps(message))
-            connection_info.message_count += 1
-            connection_info.update_ping()
-            return True
-            
-        except WebSocketDisconnect:
-            logger.info(f"WebSocket disconnected during send: {connection_id}")
-            await self.disconnect(connection_id)
+            send_queue.put_nowait((payload, result))
+        except asyncio.QueueFull:
+            logger.warning(f"Send queue full for {connection_id}, message not sent")
             return False
+        
+        return await result
+
+    async def _drain_send_queue(self, connection_id: str, send_queue: asyncio.Queue):
+        """Background task writing queued payloads to a single connection"""
+        while True:
+            payload, result = await send_queue.get()
             
-        except Exception as e:
-            logger.error(f"Error sending to {connection_id}: {e}")
-            return False
+            connection_info = self.connections.get(connection_id)
+            if connection_info is None:
+                self._resolve(result, False)
+                self._fail_queued(send_queue)
+                return
+            
+            try:
+                await connection_info.websocket.send_text(payload.decode("utf-8"))
+                connection_info.message_count += 1
+                connection_info.update_ping()
+                self._resolve(result, True)
+                
+            except asyncio.CancelledError:
+                self._resolve(result, False)
+                raise
+                
+            except WebSocketDisconnect:
+                logger.info(f"WebSocket disconnected during send: {connection_id}")
+                self._resolve(result, False)
+                await self.disconnect(connection_id)
+                self._fail_queued(send_queue)
+                return
+                
+            except Exception as e:
+                logger.error(f"Error sending to {connection_id}: {e}")
+                self._resolve(result, False)
+
+    @staticmethod
+    def _resolve(result: asyncio.Future, sent: bool):
+        """Report a write outcome to the sender, unless it stopped waiting"""
+        if not result.done():
+            result.set_result(sent)
+
+    def _fail_queued(self, send_queue: asyncio.Queue):
+        """Report every message still queued for a closed connection as not sent"""
+        while not send_queue.empty():
+            _, result = send_queue.get_nowait()
+            self._resolve(result, False)
 
     def _check_rate_limit(self, connection_id: str) -> bool:
         """Check if connection is within rate limits"""
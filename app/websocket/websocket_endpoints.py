@@ -6,6 +6,7 @@ Handles WebSocket connections for live search updates and analytics
 import json
 import logging
 from typing import Optional, Dict, Any, List
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect, Depends, HTTPException, status
 from fastapi.routing import APIRouter
 from app.websocket.connection_manager import connection_manager, EntityType
@@ -83,11 +84,11 @@ async def websocket_search_endpoint(
                 
             except json.JSONDecodeError as e:
                 logger.error(f"Invalid JSON from client {connection_id}: {e}")
-                await send_error(websocket, "Invalid JSON format")
+                await send_error_to_connection(connection_id, "Invalid JSON format")
                 
             except Exception as e:
                 logger.error(f"Error handling message from {connection_id}: {e}")
-                await send_error(websocket, "Internal server error")
+                await send_error_to_connection(connection_id, "Internal server error")
     
     except Exception as e:
         logger.error(f"WebSocket connection error: {e}")
@@ -155,9 +156,7 @@ async def handle_subscribe_message(connection_id: str, message: Dict[str, Any]):
                 "timestamp": search_event_generator.last_check.get('users', "").isoformat() if hasattr(search_event_generator.last_check.get('users', ""), 'isoformat') else str(search_event_generator.last_check.get('users', ""))
             }
             
-            connection_info = connection_manager.connections.get(connection_id)
-            if connection_info:
-                await connection_info.websocket.send_text(json.dumps(response))
+            if await connection_manager._send_to_connection(connection_id, response):
                 logger.info(f"Subscription confirmed: {connection_id} -> {query}")
         else:
             await send_error_to_connection(connection_id, "Failed to create subscription")
@@ -184,9 +183,7 @@ async def handle_unsubscribe_message(connection_id: str, message: Dict[str, Any]
             "timestamp": search_event_generator.last_check.get('users', "").isoformat() if hasattr(search_event_generator.last_check.get('users', ""), 'isoformat') else str(search_event_generator.last_check.get('users', ""))
         }
         
-        connection_info = connection_manager.connections.get(connection_id)
-        if connection_info:
-            await connection_info.websocket.send_text(json.dumps(response))
+        if await connection_manager._send_to_connection(connection_id, response):
             logger.info(f"Unsubscription processed: {connection_id} -> {subscription_id}")
             
     except Exception as e:
@@ -205,7 +202,7 @@ async def handle_ping_message(connection_id: str, message: Dict[str, Any]):
                 "timestamp": search_event_generator.last_check.get('users', "").isoformat() if hasattr(search_event_generator.last_check.get('users', ""), 'isoformat') else str(search_event_generator.last_check.get('users', ""))
             }
             
-            await connection_info.websocket.send_text(json.dumps(response))
+            await connection_manager._send_to_connection(connection_id, response)
             
     except Exception as e:
         logger.error(f"Error handling ping message: {e}")
@@ -221,32 +218,21 @@ async def handle_stats_message(connection_id: str, message: Dict[str, Any]):
             "timestamp": search_event_generator.last_check.get('users', "").isoformat() if hasattr(search_event_generator.last_check.get('users', ""), 'isoformat') else str(search_event_generator.last_check.get('users', ""))
         }
         
-        connection_info = connection_manager.connections.get(connection_id)
-        if connection_info:
-            await connection_info.websocket.send_text(json.dumps(response))
+        await connection_manager._send_to_connection(connection_id, response)
             
     except Exception as e:
         logger.error(f"Error handling stats message: {e}")
         await send_error_to_connection(connection_id, "Stats error")
 
-async def send_error(websocket: WebSocket, error_message: str):
-    """Send error message via WebSocket"""
+async def send_error_to_connection(connection_id: str, error_message: str):
+    """Send error message to a specific connection through its send queue"""
     try:
         error_response = {
             "type": "error",
             "message": error_message,
             "timestamp": search_event_generator.last_check.get('users', "").isoformat() if hasattr(search_event_generator.last_check.get('users', ""), 'isoformat') else str(search_event_generator.last_check.get('users', ""))
         }
-        await websocket.send_text(json.dumps(error_response))
-    except Exception as e:
-        logger.error(f"Failed to send error message: {e}")
-
-async def send_error_to_connection(connection_id: str, error_message: str):
-    """Send error message to a specific connection"""
-    try:
-        connection_info = connection_manager.connections.get(connection_id)
-        if connection_info:
-            await send_error(connection_info.websocket, error_message)
+        await connection_manager._send_to_connection(connection_id, error_response)
     except Exception as e:
         logger.error(f"Failed to send error to connection {connection_id}: {e}")
 
@@ -284,14 +270,14 @@ async def broadcast_test_message(
             "timestamp": search_event_generator.last_check.get('users', "").isoformat() if hasattr(search_event_generator.last_check.get('users', ""), 'isoformat') else str(search_event_generator.last_check.get('users', ""))
         }
         
-        # Send to all connections
+        # Serialize once and send to all connections through their send queues
+        payload = orjson.dumps(test_message)
         success_count = 0
-        for connection_id, connection_info in connection_manager.connections.items():
-            try:
-                await connection_info.websocket.send_text(json.dumps(test_message))
+        for connection_id in list(connection_manager.connections):
+            if await connection_manager._send_bytes(connection_id, payload):
                 success_count += 1
-            except Exception as e:
-                logger.error(f"Failed to send test message to {connection_id}: {e}")
+            else:
+                logger.error(f"Failed to send test message to {connection_id}")
         
         return {
             "success": True,